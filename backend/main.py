@@ -1,23 +1,54 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
+import json
+from contextlib import asynccontextmanager
 
+from utils.config import GPT_API_KEY, VERIFY_SETTINGS, MODEL_SETTINGS
 from utils.security_config import (
     ALLOWED_ORIGINS,
     REMOVED_HEADERS,
     CORS_SETTINGS,
     SECURITY_HEADERS
 )
-from services.llm_service import get_gpt_fact_check, analyze_politician_claim, get_gpt_chat_response
+from models import GPTModel, model_registry, batchers
+from services.llm_client import llm_client
+from services.google_service import search_manager
+from utils.nlp_pool import nlp_pool
+from utils.scheduler import llm_scheduler, classify_priority, SchedulerFull
+from services.jobs import verification_jobs, JobQueueFull
+from services.cascade import cascade_stats
+from services.chat_sessions import chat_sessions
+from services.llm_service import (
+    get_gpt_fact_check,
+    analyze_politician_claim,
+    get_gpt_chat_response,
+    stream_gpt_chat_response,
+    structured_output_stats,
+    CHAT_ERROR
+)
+from services.factcheck_index import factcheck_index
 from services.news_retrieval import (
-    fetch_articles,
-    detect_politicians,
-    POLITICIANS,
+    search_cache,
+    retrieve_evidence,
+    evidence_stats,
     POLITICIAN_INFO
 )
 from services.ui_highlighter import highlight_claims
+from services.verification import (
+    verify_claim,
+    verify_batch,
+    stream_verify_claim,
+    verdict_cache,
+    near_duplicates,
+    verification_flight,
+    invalidate_verdict,
+    gate_stats,
+    tier_stats
+)
 
 # --- Models ---
 class ClaimRequest(BaseModel):
@@ -36,6 +67,12 @@ class ChatRequest(BaseModel):
     message: str
     context: Dict[str, Any]
 
+class ChatSessionRequest(BaseModel):
+    context: Dict[str, Any] = {}  # verdict context of the original fact-check, pinned for the session
+
+class ChatMessageRequest(BaseModel):
+    message: str
+
 class PoliticianResponse(BaseModel):
     politicians: Dict[str, Any]
 
@@ -44,6 +81,10 @@ class VerifyRequest(BaseModel):
     type: str = "facebook_post"
     source: str = "facebook"
     politicians: List[str] = []
+    force: bool = False  # skip the local pre-filter and always fact-check
+
+class BatchVerifyRequest(BaseModel):
+    items: List[VerifyRequest]
 
 class VerifyResponse(BaseModel):
     is_claim: bool
@@ -61,11 +102,32 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers.update(SECURITY_HEADERS)
         return response
 
+# --- App Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: open the shared LLM connection pool
+    await llm_client.start()
+    app.state.gpt_model = GPTModel(GPT_API_KEY)
+    nlp_pool.start()
+    verification_jobs.start()
+    if MODEL_SETTINGS["warm_up"]:
+        model_registry.warm_up_in_background(MODEL_SETTINGS["warm_up_models"])
+    yield
+    # Shutdown: stop job workers, then drain and close pooled connections
+    await verification_jobs.shutdown()
+    await llm_client.close()
+    await search_manager.close()
+    for batcher in batchers.values():
+        await batcher.close()
+    nlp_pool.shutdown()
+    app.state.gpt_model = None
+
 # --- App Configuration ---
 app = FastAPI(
     title="Filipino Fact Check API",
     description="API for detecting and fact-checking claims in English and Filipino text",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS middleware with specific settings
@@ -102,46 +164,114 @@ def get_classification_style(classification: str) -> str:
     }
     return styles.get(classification, "dashed")
 
-def get_canonical_name(politician: str) -> str:
-    aliases = {
-        "BBM": "Ferdinand Marcos Jr.",
-        "Bongbong Marcos": "Ferdinand Marcos Jr.",
-        "Noynoy Aquino": "Benigno Aquino III",
-        "GMA": "Gloria Macapagal Arroyo",
-        "Chiz Escudero": "Francis Escudero",
-        "Ping Lacson": "Panfilo Lacson",
-        "Dick Gordon": "Richard Gordon"
-    }
-    return aliases.get(politician, politician)
+async def to_sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Encode pipeline events as server-sent events"""
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+def too_busy(error: SchedulerFull) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": str(error.retry_after)})
+
+def admit_stream(priority: str):
+    """Reject a streaming request up front when its queue is full, before the 200 is sent"""
+    if not llm_scheduler.admits(priority):
+        raise too_busy(SchedulerFull(priority, llm_scheduler.retry_after(priority)))
+
+async def scheduled_stream(events: AsyncIterator[Dict[str, Any]], priority: str) -> AsyncIterator[Dict[str, Any]]:
+    """Hold a scheduler slot for the lifetime of an LLM stream"""
+    try:
+        async with llm_scheduler.slot(priority):
+            async for event in events:
+                yield event
+    except SchedulerFull as e:
+        yield {"event": "error", "data": {"message": str(e), "retry_after": e.retry_after}}
 
 # Update verify endpoint to handle errors properly
 @app.post("/verify")
 async def verify_content(request: VerifyRequest):
     try:
-        result = await get_gpt_fact_check(request.text)
+        result = await verify_claim(
+            request.text,
+            force=request.force,
+            priority=classify_priority(request.type, request.source)
+        )
         if result["status"] == "error":
             raise HTTPException(status_code=500, detail=result["message"])
         return result
+    except SchedulerFull as e:
+        raise too_busy(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Error processing request: {str(e)}"
         )
 
+@app.post("/verify/stream")
+async def verify_content_stream(request: VerifyRequest):
+    """Stream the verdict as SSE: classification first, then explanation and sources"""
+    priority = classify_priority(request.type, request.source)
+    admit_stream(priority)
+    return StreamingResponse(
+        to_sse(stream_verify_claim(request.text, force=request.force, priority=priority)),
+        media_type="text/event-stream"
+    )
+
+@app.post("/verify/batch")
+async def verify_content_batch(request: BatchVerifyRequest):
+    """Verify several posts in one round trip; results keep the input order"""
+    if len(request.items) > VERIFY_SETTINGS["max_batch_size"]:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {VERIFY_SETTINGS['max_batch_size']} items"
+        )
+    results = await verify_batch([
+        {"text": item.text, "force": item.force, "priority": classify_priority(item.type, item.source)}
+        for item in request.items
+    ])
+    return {
+        "status": "success",
+        "results": results
+    }
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: VerifyRequest):
+    """Queue a verification and return its job id at once; fetch the result from GET /jobs/{job_id}"""
+    try:
+        job = verification_jobs.submit(
+            text=request.text,
+            force=request.force,
+            priority=classify_priority(request.type, request.source)
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """Job status and, once done, its result. With wait > 0, long-poll up to that many seconds."""
+    job = verification_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    job = await verification_jobs.wait(job, wait)
+    return job.to_dict()
+
 @app.post("/fact-check")
 async def fact_check(request: VerifyRequest):
     """Endpoint for fact-checking content"""
     try:
-        result = await get_gpt_fact_check(request.text)
+        # Explicit user requests always run ahead of the background feed scan
+        result = await verify_claim(request.text, force=request.force, priority="interactive")
         if result["status"] == "error":
             raise HTTPException(status_code=500, detail=result["message"])
+        if result["status"] == "not_applicable":
+            return result
         return {
-            "status": "success",
-            "classification": result["classification"],
-            "analysis": result["analysis"],
+            **result,
             "style": get_classification_style(result["classification"]),
             "color": get_classification_color(result["classification"])
         }
+    except SchedulerFull as e:
+        raise too_busy(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -152,10 +282,13 @@ async def fact_check(request: VerifyRequest):
 async def analyze_text(text: str):
     try:
         # Process directly through LLM
-        result = await app.state.gpt_model.analyze_text(text)
+        async with llm_scheduler.slot("interactive"):
+            result = await app.state.gpt_model.analyze_text(text)
         
         return {"result": result}
         
+    except SchedulerFull as e:
+        raise too_busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -168,26 +301,121 @@ async def highlight_text(request: HighlightRequest):
             status_code=400,
             detail="Text cannot be empty" if request.language == "en" else "Hindi maaaring walang laman ang teksto"
         )
-    return highlight_claims(text)
+    try:
+        return await highlight_claims(text)
+    except SchedulerFull as e:
+        raise too_busy(e)
+
+@app.post("/evidence")
+async def evidence(request: ClaimRequest):
+    """Search the government, news and fact-check tiers concurrently for evidence on a claim."""
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    return await retrieve_evidence(request.text.strip())
 
 @app.post("/chat")
 async def chat(request: ChatRequest):
     try:
-        response = await get_gpt_chat_response(
-            message=request.message,
-            context=request.context
-        )
+        async with llm_scheduler.slot("interactive"):
+            response = await get_gpt_chat_response(
+                message=request.message,
+                context=request.context
+            )
         return {
             "status": "success",
             "response": response
         }
+    except SchedulerFull as e:
+        raise too_busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the chat answer token by token as SSE"""
+    admit_stream("interactive")
+    return StreamingResponse(
+        to_sse(scheduled_stream(stream_gpt_chat_response(message=request.message, context=request.context), "interactive")),
+        media_type="text/event-stream"
+    )
+
+@app.post("/chat/sessions", status_code=201)
+async def create_chat_session(request: ChatSessionRequest):
+    """Start a server-side chat session; later turns send only the new message"""
+    session = chat_sessions.create(request.context)
+    return {"session_id": session.id, "idle_ttl": chat_sessions.settings["idle_ttl"]}
+
+def get_chat_session(session_id: str):
+    session = chat_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired chat session")
+    return session
+
+@app.post("/chat/sessions/{session_id}/messages")
+async def chat_session_message(session_id: str, request: ChatMessageRequest):
+    session = get_chat_session(session_id)
+    try:
+        async with llm_scheduler.slot("interactive"):
+            response = await chat_sessions.send(session, request.message)
+    except SchedulerFull as e:
+        raise too_busy(e)
+    if response == CHAT_ERROR:
+        raise HTTPException(status_code=500, detail="Failed to get response from GPT")
+    return {
+        "status": "success",
+        "session_id": session.id,
+        "response": response
+    }
+
+@app.post("/chat/sessions/{session_id}/messages/stream")
+async def chat_session_message_stream(session_id: str, request: ChatMessageRequest):
+    """Stream a session turn token by token as SSE"""
+    session = get_chat_session(session_id)
+    admit_stream("interactive")
+    return StreamingResponse(
+        to_sse(scheduled_stream(chat_sessions.stream(session, request.message), "interactive")),
+        media_type="text/event-stream"
+    )
+
+@app.delete("/chat/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    if not chat_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired chat session")
+    return {"status": "success"}
+
 @app.get("/politicians", response_model=PoliticianResponse)
 async def get_politicians():
     return {"politicians": POLITICIAN_INFO}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Cache and pipeline counters"""
+    return {
+        "verdict_cache": verdict_cache.stats(),
+        "near_duplicates": near_duplicates.stats(),
+        "search_cache": search_cache.stats(),
+        "evidence": evidence_stats(),
+        "factcheck_index": factcheck_index.stats(),
+        "single_flight": verification_flight.stats(),
+        "gate": gate_stats(),
+        "verification_tiers": tier_stats(),
+        "cascade": cascade_stats(),
+        "structured_output": structured_output_stats(),
+        "llm": llm_client.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "jobs": verification_jobs.stats(),
+        "chat_sessions": chat_sessions.stats(),
+        "models": model_registry.stats(),
+        "micro_batching": {name: batcher.stats() for name, batcher in batchers.items()},
+        "nlp_pool": nlp_pool.stats(),
+        "search_keys": search_manager.key_scheduler.stats()
+    }
+
+@app.post("/cache/invalidate")
+async def invalidate_cache(request: ClaimRequest):
+    """Drop the cached verdict for a claim"""
+    return {"invalidated": invalidate_verdict(request.text)}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint with CORS verification."""
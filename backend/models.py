@@ -1,49 +1,193 @@
-from transformers import pipeline
-from typing import Dict, Any
-from openai import AsyncOpenAI
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.config import MODEL_PATHS, MODEL_SETTINGS, BATCH_SETTINGS
+from utils.batching import MicroBatcher
+from services.llm_client import llm_client
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB, when psutil is available"""
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+class ModelRegistry:
+    """
+    Loads each registered model on first use. A per-model lock makes concurrent
+    first calls load it only once; load time and memory growth are recorded.
+    A failed load is recorded and re-raised; calls within load_retry_seconds of
+    the failure raise at once instead of running the loader again.
+    """
+    def __init__(self, load_retry_seconds: float = MODEL_SETTINGS["load_retry_seconds"]):
+        self.load_retry_seconds = load_retry_seconds
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Any] = {}
+        self._failures: Dict[str, Tuple[Exception, float]] = {}
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name in self._models:
+            return self._models[name]
+        with self._locks[name]:
+            if name not in self._models:
+                self._load(name)
+        return self._models[name]
+
+    def _load(self, name: str):
+        """Run the loader for name; the caller holds its lock"""
+        failure = self._failures.get(name)
+        if failure is not None and time.monotonic() - failure[1] < self.load_retry_seconds:
+            raise RuntimeError(f"Model {name} failed to load recently: {failure[0]}") from failure[0]
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        try:
+            model = self._loaders[name]()
+        except Exception as e:
+            failures = self.metrics.get(name, {}).get("failures", 0) + 1
+            self._failures[name] = (e, time.monotonic())
+            self.metrics[name] = {"error": str(e), "failures": failures}
+            raise
+        rss_after = _rss_mb()
+        self._failures.pop(name, None)
+        self.metrics[name] = {
+            "load_seconds": round(time.perf_counter() - start, 3),
+            "rss_delta_mb": round(rss_after - rss_before, 1) if rss_before is not None else None
+        }
+        self._models[name] = model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[List[str]] = None):
+        """Load models ahead of first use; failures are recorded, not raised"""
+        for name in (list(self._loaders) if names is None else names):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Model warm-up failed for {name}: {str(e)}")
+
+    def warm_up_in_background(self, names: Optional[List[str]] = None) -> threading.Thread:
+        thread = threading.Thread(target=self.warm_up, args=(names,), name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"loaded": self.is_loaded(name), **self.metrics.get(name, {})}
+            for name in self._loaders
+        }
+
+def _pipeline_loader(task: str, path: str) -> Callable[[], Any]:
+    def load():
+        # Imported here so importing models.py never pulls in transformers
+        from transformers import pipeline
+        return pipeline(task, model=path)
+    return load
+
+def _load_spacy():
+    # Failures (spaCy or the model not installed) propagate so the registry records them
+    import spacy
+    return spacy.load(MODEL_PATHS["spacy"])
+
+model_registry = ModelRegistry()
+model_registry.register("nli", _pipeline_loader("text-classification", MODEL_PATHS["nli"]))
+model_registry.register("nle", _pipeline_loader("text2text-generation", MODEL_PATHS["nle"]))
+model_registry.register("ner", _pipeline_loader("ner", MODEL_PATHS["ner"]))
+model_registry.register("spacy", _load_spacy)
+
+def _micro_batcher(name: str) -> MicroBatcher:
+    def run_batch(inputs: List[str]) -> List[Any]:
+        return model_registry.get(name)(inputs, batch_size=len(inputs))
+    return MicroBatcher(
+        run_batch,
+        max_batch_size=BATCH_SETTINGS["max_batch_size"],
+        max_wait=BATCH_SETTINGS["max_wait_ms"] / 1000
+    )
+
+# One batching queue per model, shared by every instance
+batchers: Dict[str, MicroBatcher] = {
+    "nli": _micro_batcher("nli"),
+    "ner": _micro_batcher("ner")
+}
 
 class NLIModel:
-    def __init__(self):
-        self.model = pipeline("text-classification", model="c:/Users/Denim/OneDrive/Documents/Extension/backend/NLI_model")
+    @property
+    def model(self):
+        return model_registry.get("nli")
 
     def predict(self, premise, hypothesis):
         return self.model(f"{premise} entails {hypothesis}")
 
+    async def predict_async(self, premise, hypothesis):
+        """predict() through the shared micro-batching queue"""
+        return await batchers["nli"].submit(f"{premise} entails {hypothesis}")
+
+    async def entailment_async(self, premise: str, hypothesis: str) -> Tuple[str, float]:
+        """
+        Score a premise/hypothesis pair as a sentence pair, through the micro-batching
+        queue. Returns ("entailment" | "contradiction" | "neutral", confidence).
+        """
+        prediction = await batchers["nli"].submit({"text": premise, "text_pair": hypothesis})
+        if isinstance(prediction, list):
+            prediction = prediction[0]
+        label = prediction["label"].lower()
+        for relation in ("entailment", "contradiction"):
+            if relation[:6] in label:
+                return relation, float(prediction["score"])
+        return "neutral", float(prediction["score"])
+
 class NLEModel:
-    def __init__(self):
-        self.model = pipeline("text2text-generation", model="c:/Users/Denim/OneDrive/Documents/Extension/backend/NLE_model")
+    @property
+    def model(self):
+        return model_registry.get("nle")
 
     def explain(self, text):
         return self.model(text)
 
 class NERModel:
-    def __init__(self):
-        self.model = pipeline("ner", model="c:/Users/Denim/OneDrive/Documents/Extension/backend/NER_model")
+    @property
+    def model(self):
+        return model_registry.get("ner")
 
     def recognize(self, text):
         return self.model(text)
 
+    async def recognize_async(self, text):
+        """recognize() through the shared micro-batching queue"""
+        return await batchers["ner"].submit(text)
+
 class GPTModel:
     def __init__(self, api_key: str):
         if not api_key:
             raise ValueError("API key is required")
         
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client = llm_client
 
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            response = await self.client.chat_completion({
+                "model": "gpt-3.5-turbo",
+                "messages": [
                     {"role": "system", "content": "You are an expert Filipino fact-checker."},
                     {"role": "user", "content": f"Analyze this claim: {text}"}
                 ],
-                max_tokens=1500,
-                temperature=0.3
-            )
+                "max_tokens": 1500,
+                "temperature": 0.3
+            }, api_key=self.api_key)
             return {
                 "status": "success",
-                "analysis": response.choices[0].message.content
+                "analysis": response["choices"][0]["message"]["content"]
             }
         except Exception as e:
             return {
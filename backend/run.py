@@ -38,6 +38,7 @@ if not check_dependencies():
 
 from main import app
 from models import GPTModel
+from services.llm_client import llm_client
 
 # Global model instance
 gpt_model = None
@@ -75,6 +76,9 @@ async def validate_model():
     except Exception as e:
         print(f"ERROR! {str(e)}")
         return False
+    finally:
+        # The validation loop ends here; the server opens its own pool in its lifespan
+        await llm_client.close()
 
 # Replace on_event with lifespan context manager
 @asynccontextmanager
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from models import NLIModel
+from services.llm_service import FactCheckResult
+from services.news_retrieval import retrieve_evidence
+from utils.config import CASCADE_SETTINGS
+
+nli_model = NLIModel()
+
+cascade_counters = {"checked": 0, "true": 0, "false": 0, "uncertain": 0, "conflicting": 0, "no_evidence": 0, "errors": 0}
+
+def _premise(item: Dict) -> str:
+    return ". ".join(part.strip() for part in (item.get("title"), item.get("snippet")) if part and part.strip())
+
+def _source(item: Dict) -> str:
+    return f"{item.get('title', item.get('link'))} - {item.get('link')}"
+
+async def nli_verdict(text: str) -> Optional[Dict]:
+    """
+    Score the claim against retrieved evidence snippets with the local NLI model.
+    Returns a TRUE/FALSE result when enough snippets confidently entail or contradict
+    it (and none confidently point the other way), or None to escalate to the LLM.
+    Never raises: a failed search or NLI call is counted in errors and escalates.
+    """
+    cascade_counters["checked"] += 1
+    try:
+        evidence = await retrieve_evidence(text)
+        items = [item for item in evidence["items"] if _premise(item)][:CASCADE_SETTINGS["max_snippets"]]
+        if not items:
+            cascade_counters["no_evidence"] += 1
+            return None
+        scores: List[Tuple[str, float]] = await asyncio.gather(
+            *(nli_model.entailment_async(_premise(item), text) for item in items)
+        )
+    except Exception as e:
+        print(f"NLI cascade failed: {str(e)}")
+        cascade_counters["errors"] += 1
+        return None
+
+    supporting = [(item, score) for item, (relation, score) in zip(items, scores)
+                  if relation == "entailment" and score >= CASCADE_SETTINGS["entail_threshold"]]
+    refuting = [(item, score) for item, (relation, score) in zip(items, scores)
+                if relation == "contradiction" and score >= CASCADE_SETTINGS["contradict_threshold"]]
+    if supporting and refuting:
+        cascade_counters["conflicting"] += 1
+        return None
+    agreeing = supporting or refuting
+    if len(agreeing) < CASCADE_SETTINGS["min_sources"]:
+        cascade_counters["uncertain"] += 1
+        return None
+
+    classification = "TRUE" if supporting else "FALSE"
+    cascade_counters[classification.lower()] += 1
+    confidence = max(score for _, score in agreeing)
+    explanation = (
+        f"{len(agreeing)} of {len(items)} retrieved sources "
+        f"{'support' if supporting else 'contradict'} this claim (NLI confidence {confidence:.2f})."
+    )
+    return FactCheckResult(
+        classification=classification,
+        explanation=explanation,
+        evidence=[_premise(item) for item, _ in agreeing],
+        sources=[_source(item) for item, _ in agreeing]
+    ).to_result(explanation)
+
+def cascade_stats() -> Dict:
+    return dict(cascade_counters)
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+from utils.config import CHAT_SESSION_SETTINGS
+from services.llm_service import CHAT_ERROR, get_gpt_chat_response, stream_gpt_chat_response, summarize_chat_history
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token, plus per-message overhead)"""
+    return len(text) // 4 + 4
+
+def _pin_context(context: Any, budget: int) -> str:
+    """Serialize the fact-check context once, capped at the context token budget"""
+    text = context if isinstance(context, str) else json.dumps(context, ensure_ascii=False)
+    max_chars = budget * 4
+    return text if len(text) <= max_chars else text[:max_chars] + "..."
+
+class ChatSession:
+    def __init__(self, context: str):
+        self.id = uuid.uuid4().hex
+        self.context = context  # pinned: sent with every message, never truncated away
+        self.summary = ""
+        self.turns: List[Dict[str, str]] = []
+        self.last_active = time.time()
+        self.lock = asyncio.Lock()  # one turn at a time per session
+
+class ChatSessionStore:
+    """
+    Chat history kept server-side under a session id, so each turn sends only the
+    new message. Sessions expire after idle_ttl seconds. Earlier turns are sent
+    newest first up to history_budget tokens; turns that no longer fit are folded
+    into a running summary (or dropped when summarizing is off or fails).
+    A session with a turn in flight is never expired.
+    """
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = settings or CHAT_SESSION_SETTINGS
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self.counters = {"created": 0, "expired": 0, "messages": 0, "summarized_turns": 0, "dropped_turns": 0}
+
+    def _purge(self):
+        cutoff = time.time() - self.settings["idle_ttl"]
+        overflow = len(self._sessions) - self.settings["max_sessions"]
+        expired = []
+        for session in self._sessions.values():
+            if session.last_active > cutoff and len(expired) >= overflow:
+                break
+            # A locked session has a turn in flight; expiring it would orphan the turn
+            if not session.lock.locked():
+                expired.append(session.id)
+        for session_id in expired:
+            del self._sessions[session_id]
+        self.counters["expired"] += len(expired)
+
+    def create(self, context: Any) -> ChatSession:
+        session = ChatSession(_pin_context(context, self.settings["context_budget"]))
+        self._sessions[session.id] = session
+        self.counters["created"] += 1
+        self._purge()
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        self._purge()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._touch(session)
+        return session
+
+    def _touch(self, session: ChatSession):
+        session.last_active = time.time()
+        if session.id in self._sessions:
+            self._sessions.move_to_end(session.id)
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    async def _fit_history(self, session: ChatSession) -> List[Dict[str, str]]:
+        """Earlier turns that fit the token budget, behind the summary of older ones"""
+        budget = self.settings["history_budget"]
+        used = estimate_tokens(session.summary) if session.summary else 0
+        kept = 0
+        for turn in reversed(session.turns):
+            cost = estimate_tokens(turn["content"])
+            if used + cost > budget:
+                break
+            used += cost
+            kept += 1
+
+        overflow = session.turns[:len(session.turns) - kept]
+        if overflow:
+            summary = None
+            if self.settings["summarize"]:
+                summary = await summarize_chat_history(session.summary, overflow, self.settings["summary_max_tokens"])
+            if summary is not None:
+                session.summary = summary
+                self.counters["summarized_turns"] += len(overflow)
+            else:
+                self.counters["dropped_turns"] += len(overflow)
+            session.turns = session.turns[len(overflow):]
+
+        history = list(session.turns)
+        if session.summary:
+            history.insert(0, {"role": "system", "content": f"Summary of the earlier conversation: {session.summary}"})
+        return history
+
+    def _record(self, session: ChatSession, message: str, response: str):
+        session.turns.append({"role": "user", "content": message})
+        session.turns.append({"role": "assistant", "content": response})
+        self._touch(session)
+        self.counters["messages"] += 1
+
+    async def send(self, session: ChatSession, message: str) -> str:
+        """Answer one turn; returns CHAT_ERROR, and keeps nothing, when the LLM call fails"""
+        async with session.lock:
+            self._touch(session)
+            history = await self._fit_history(session)
+            response = await get_gpt_chat_response(message, session.context, history)
+            # Failed turns are not kept, so a retry does not see the error message
+            if response != CHAT_ERROR:
+                self._record(session, message, response)
+            return response
+
+    async def stream(self, session: ChatSession, message: str) -> AsyncIterator[Dict]:
+        async with session.lock:
+            self._touch(session)
+            history = await self._fit_history(session)
+            async for event in stream_gpt_chat_response(message, session.context, history):
+                if event["event"] == "done":
+                    self._record(session, message, event["data"]["response"])
+                yield event
+
+    def stats(self) -> Dict:
+        return {**self.counters, "active": len(self._sessions)}
+
+chat_sessions = ChatSessionStore()
@@ -0,0 +1,248 @@
+"""
+Local index of published fact-checks (Vera Files, Tsek.ph, AFP Philippines), consulted
+before the LLM. Built offline from a JSONL dump, one article per line:
+
+    {"url": ..., "title": ..., "claim": ..., "rating": ..., "source": ..., "published": ...}
+
+Usage, from the backend directory:
+
+    python -m services.factcheck_index ingest factchecks.jsonl --db factchecks.db
+    python -m services.factcheck_index search "claim text" --db factchecks.db
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+from services.llm_service import FactCheckResult
+from utils.config import FACTCHECK_INDEX_SETTINGS
+from utils.source_index import get_source_index
+
+# Publisher ratings mapped onto our classifications; unmapped ratings are not indexed
+RATING_CLASSIFICATIONS = {
+    "false": "FALSE", "fake": "FALSE", "fake news": "FALSE", "wrong": "FALSE", "incorrect": "FALSE",
+    "hoax": "FALSE", "fabricated": "FALSE", "mali": "FALSE", "pants on fire": "FALSE",
+    "misleading": "MISLEADING", "needs context": "MISLEADING", "missing context": "MISLEADING",
+    "partly false": "MISLEADING", "half true": "MISLEADING", "mostly false": "MISLEADING",
+    "exaggerated": "MISLEADING", "out of context": "MISLEADING", "nakalilinlang": "MISLEADING",
+    "true": "TRUE", "accurate": "TRUE", "correct": "TRUE", "mostly true": "TRUE", "totoo": "TRUE",
+    "unproven": "UNVERIFIED", "no basis": "UNVERIFIED", "unverified": "UNVERIFIED", "unsupported": "UNVERIFIED"
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "he", "her", "his",
+    "in", "is", "it", "its", "of", "on", "or", "she", "that", "the", "their", "they", "this", "to",
+    "was", "were", "will", "with", "ang", "ng", "sa", "na", "mga", "si", "ay", "at", "ni", "kay",
+    "ito", "iyan", "yung", "po", "daw", "raw", "lang", "din", "rin", "hindi", "may", "para"
+}
+
+SCHEMA = """
+CREATE TABLE docs (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    claim TEXT NOT NULL,
+    rating TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    source_name TEXT,
+    published TEXT
+);
+CREATE VIRTUAL TABLE docs_fts USING fts5(
+    claim, title, content='docs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+# Matches in the claim count double against matches in the headline
+BM25_WEIGHTS = "2.0, 1.0"
+
+def terms(text: str) -> List[str]:
+    """Lowercased, accent-stripped word tokens without stopwords, in order of first use"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return list(dict.fromkeys(word for word in re.findall(r"\w+", text) if len(word) > 1 and word not in STOPWORDS))
+
+def classify_rating(rating: str) -> Optional[str]:
+    rating = re.sub(r"[^\w\s]", "", rating.casefold()).strip()
+    return RATING_CLASSIFICATIONS.get(rating)
+
+def build_index(path: str, records: Iterable[Dict]) -> Dict[str, int]:
+    """
+    Build a fresh index at path from fact-check records. The index is written to a
+    temporary file and swapped in atomically, so a running server never reads a
+    half-built index.
+    """
+    counts = {"read": 0, "indexed": 0, "duplicates": 0, "unrated": 0, "invalid": 0}
+    tmp_path = f"{path}.building"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+    seen = set()
+    source_index = get_source_index()
+    rows = []
+    for record in records:
+        counts["read"] += 1
+        url = (record.get("url") or "").strip()
+        claim = (record.get("claim") or record.get("title") or "").strip()
+        if not url or not claim:
+            counts["invalid"] += 1
+            continue
+        if url in seen:
+            counts["duplicates"] += 1
+            continue
+        classification = classify_rating(record.get("rating") or "")
+        if classification is None:
+            counts["unrated"] += 1
+            continue
+        seen.add(url)
+        match = source_index.match(url, ("factcheck",))
+        source_name = record.get("source") or (match.source_name if match else None)
+        rows.append((url, record.get("title") or claim, claim, record["rating"], classification,
+                     source_name, record.get("published")))
+    conn.executemany(
+        "INSERT INTO docs (url, title, claim, rating, classification, source_name, published) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp_path, path)
+    counts["indexed"] = len(rows)
+    return counts
+
+def read_jsonl(path: str) -> Iterable[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+class FactCheckIndex:
+    """
+    Read-only BM25 lookups over the SQLite FTS5 index. Each thread gets its own
+    connection with the database memory-mapped, so lookups stay in the low
+    milliseconds at hundreds of thousands of articles.
+    """
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.path = settings["path"]
+        self._local = threading.local()
+        self.counters = {"lookups": 0, "hits": 0, "misses": 0, "errors": 0, "total_ms": 0.0}
+
+    def available(self) -> bool:
+        return bool(self.settings["enabled"] and self.path and os.path.exists(self.path))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={int(self.settings['mmap_size'])}")
+            self._local.conn = conn
+        return conn
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[Dict]:
+        """Top BM25 candidates for the text, each with its score and claim-term coverage"""
+        query_terms = terms(text)[:self.settings["max_query_terms"]]
+        if not query_terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in query_terms)
+        rows = self._connection().execute(
+            f"SELECT d.url, d.title, d.claim, d.rating, d.classification, d.source_name, "
+            f"-bm25(docs_fts, {BM25_WEIGHTS}) AS score "
+            f"FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+            f"WHERE docs_fts MATCH ? ORDER BY bm25(docs_fts, {BM25_WEIGHTS}) LIMIT ?",
+            (match, limit or self.settings["candidates"])
+        ).fetchall()
+        post_terms = set(query_terms)
+        candidates = []
+        for url, title, claim, rating, classification, source_name, score in rows:
+            claim_terms = terms(claim)
+            coverage = len(post_terms.intersection(claim_terms)) / len(claim_terms) if claim_terms else 0.0
+            candidates.append({
+                "url": url, "title": title, "claim": claim, "rating": rating,
+                "classification": classification, "source_name": source_name,
+                "score": round(score, 3), "coverage": round(coverage, 3)
+            })
+        return candidates
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """
+        A fact-check result built from the best matching published fact-check, or None
+        when nothing clears both the BM25 score and claim coverage thresholds.
+        """
+        self.counters["lookups"] += 1
+        start = time.perf_counter()
+        try:
+            candidates = self.search(text)
+        except sqlite3.Error as e:
+            print(f"Fact-check index lookup failed: {str(e)}")
+            self.counters["errors"] += 1
+            return None
+        finally:
+            self.counters["total_ms"] += (time.perf_counter() - start) * 1000
+
+        matches = [c for c in candidates
+                   if c["score"] >= self.settings["min_score"] and c["coverage"] >= self.settings["min_coverage"]]
+        if not matches:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        best = max(matches, key=lambda c: (c["coverage"], c["score"]))
+        publisher = best["source_name"] or "A fact-checker"
+        explanation = f"{publisher} rated this claim {best['rating']}: \"{best['claim']}\""
+        result = FactCheckResult(
+            classification=best["classification"],
+            explanation=explanation,
+            evidence=[f"{best['title']} ({publisher}, rated {best['rating']})"],
+            sources=[f"{best['title']} - {best['url']}"]
+        ).to_result(explanation)
+        return {**result, "fact_check": best}
+
+    def stats(self) -> Dict:
+        lookups = self.counters["lookups"]
+        return {
+            **{k: v for k, v in self.counters.items() if k != "total_ms"},
+            "available": self.available(),
+            "avg_ms": round(self.counters["total_ms"] / lookups, 3) if lookups else 0.0
+        }
+
+factcheck_index = FactCheckIndex(FACTCHECK_INDEX_SETTINGS)
+
+async def lookup_fact_check(text: str) -> Optional[Dict]:
+    """Published fact-check verdict for the text, if the local index has one"""
+    if not factcheck_index.available():
+        return None
+    return await asyncio.to_thread(factcheck_index.lookup, text)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build or query the local fact-check index")
+    parser.add_argument("--db", default=FACTCHECK_INDEX_SETTINGS["path"], help="index path (default: FACTCHECK_INDEX_DB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="rebuild the index from a JSONL dump of fact-check articles")
+    ingest.add_argument("dump")
+    search = commands.add_parser("search", help="show the best matching fact-checks for a text")
+    search.add_argument("text")
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("no index path: pass --db or set FACTCHECK_INDEX_DB")
+
+    if args.command == "ingest":
+        start = time.perf_counter()
+        counts = build_index(args.db, read_jsonl(args.dump))
+        print(json.dumps(counts), f"in {time.perf_counter() - start:.1f}s")
+    else:
+        index = FactCheckIndex({**FACTCHECK_INDEX_SETTINGS, "path": args.db})
+        result = index.lookup(args.text)
+        for candidate in index.search(args.text):
+            print(json.dumps(candidate, ensure_ascii=False))
+        print("verdict:", result["classification"] if result else None)
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,109 @@
+import asyncio
+import aiohttp
 from typing import List, Dict, Optional
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from utils.config import GOOGLE_API_KEYS, GOOGLE_SEARCH_CX, get_source_patterns
+from utils.config import GOOGLE_API_KEYS, GOOGLE_SEARCH_CX, GOOGLE_KEY_SETTINGS, SEARCH_SETTINGS
 from utils.gpt_utils import generate_sources_gpt  # Import the GPT utility
+from services.key_scheduler import KeyScheduler, KeyState
+from utils.source_index import get_source_index
 
 # Google Search API configuration
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 
+# Source types whose results each search type keeps
+SEARCH_TYPE_SOURCES = {
+    "news": ("news", "government"),
+    "government": ("government",),
+    "factcheck": ("factcheck",)
+}
+
 class SearchManager:
-    def __init__(self):
-        self.current_key_index = 0
+    """
+    Async client for the Custom Search JSON API. One pooled aiohttp session is
+    reused for every query, so searches never block the event loop. Queries are
+    spread over every configured API key; the GPT fallback is used only once
+    every key is rate-limited or out of daily quota.
+    """
+    def __init__(self, base_url: str = GOOGLE_SEARCH_URL, settings: Optional[Dict] = None):
         self.use_gpt_fallback = False
+        self.base_url = base_url
+        self.settings = settings or SEARCH_SETTINGS
+        self.key_scheduler = KeyScheduler(
+            [key for key in GOOGLE_API_KEYS if key],
+            rate=1 / self.settings["min_request_interval"],
+            burst=GOOGLE_KEY_SETTINGS["burst"],
+            daily_quota=GOOGLE_KEY_SETTINGS["daily_quota"],
+            cooldown=GOOGLE_KEY_SETTINGS["cooldown"]
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._key_params: Dict[str, Dict] = {}
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Return the Custom Search session; every API key shares its connections"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.settings["max_connections"], keepalive_timeout=30)
+            timeout = aiohttp.ClientTimeout(total=self.settings["request_timeout"])
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def close(self):
+        """Close the search session; the next query opens a fresh one"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _service_params(self, api_key: str) -> Dict:
+        """Fixed request parameters per API key, built once and reused"""
+        if api_key not in self._key_params:
+            self._key_params[api_key] = {"key": api_key, "cx": GOOGLE_SEARCH_CX, "num": self.settings["max_results"]}
+        return self._key_params[api_key]
+
+    async def _request(self, state: KeyState, query: str) -> Optional[Dict]:
+        """
+        One Custom Search call with the given key. Returns the JSON body, or None
+        after recording the failure against the key.
+        """
+        session = await self.start()
+        params = {**self._service_params(state.key), "q": query}
+        try:
+            async with session.get(self.base_url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                body = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Google API error: {str(e)}")
+            self.key_scheduler.report_error(state)
+            return None
+
+        print(f"Google API error: {response.status} {body}")
+        if response.status in (403, 429):
+            # 403 means the key's daily quota (or access) is gone; 429 may be per-minute or per-day
+            daily = response.status == 403 or "per day" in body.lower() or "dailylimitexceeded" in body.lower()
+            self.key_scheduler.report_quota_error(state, daily=daily)
+        else:
+            self.key_scheduler.report_error(state)
+        return None
 
     async def _api_search(self, query: str, search_type: str) -> Optional[Dict]:
         if self.use_gpt_fallback:
             return await generate_sources_gpt(query)
         
-        try:
-            service = build("customsearch", "v1", developerKey=GOOGLE_API_KEYS[self.current_key_index])
-            res = service.cse().list(q=query, cx=GOOGLE_SEARCH_CX, num=10).execute()
-            filtered_items = self._filter_results(res.get('items', []))
-            return {"items": filtered_items}
-        except HttpError as e:
-            print(f"Google API error: {str(e)}")
-            return None
+        for _ in range(self.settings["max_retries"]):
+            state = await self.key_scheduler.acquire(GOOGLE_KEY_SETTINGS["max_wait"])
+            if state is None:
+                break
+            res = await self._request(state, query)
+            if res is not None:
+                source_types = SEARCH_TYPE_SOURCES.get(search_type, SEARCH_TYPE_SOURCES["news"])
+                filtered_items = self._filter_results(res.get('items', []), source_types)
+                return {"items": filtered_items}
+
+        # Fall back to GPT-generated sources only when no key can serve the query
+        if self.key_scheduler.all_exhausted():
+            return await generate_sources_gpt(query)
+        return None
 
-    def _filter_results(self, items: List[Dict]) -> List[Dict]:
-        allowed_patterns = get_source_patterns("news") + get_source_patterns("government")
-        filtered_items = [item for item in items if any(pattern in item['link'] for pattern in allowed_patterns)]
-        return filtered_items
+    def _filter_results(self, items: List[Dict], source_types=("news", "government")) -> List[Dict]:
+        """Keep results from configured sources; each kept item gains source_type and source_name"""
+        return get_source_index().filter(items, source_types)
 
 search_manager = SearchManager()
\ No newline at end of file
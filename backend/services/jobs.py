@@ -0,0 +1,144 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from utils.config import JOB_SETTINGS
+from services.verification import verify_claim
+
+class JobQueueFull(RuntimeError):
+    """Raised by submit() when the job queue is at capacity; retry_after is a hint in seconds"""
+    def __init__(self, retry_after: int):
+        super().__init__("Server busy: job queue is full")
+        self.retry_after = retry_after
+
+class Job:
+    def __init__(self, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = "queued"  # queued -> running -> done | error
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.finished = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        job = {"job_id": self.id, "status": self.status, "created_at": self.created_at}
+        if self.status == "done":
+            job["result"] = self.result
+        elif self.status == "error":
+            job["error"] = self.error
+        if self.finished_at is not None:
+            job["finished_at"] = self.finished_at
+        return job
+
+class JobManager:
+    """
+    In-process job queue drained by a fixed pool of worker tasks. Submitting returns
+    at once; callers fetch the result by job id, optionally long-polling until it
+    is ready. Finished jobs are kept for JOB_SETTINGS["result_ttl"] seconds, so the
+    number of open client connections no longer tracks in-flight LLM calls.
+    """
+    def __init__(self, handler: Callable[..., Awaitable[Dict]], settings: Optional[Dict] = None):
+        self.handler = handler
+        self.settings = settings or JOB_SETTINGS
+        self._jobs: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()  # job id -> expiry, in finish order
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._avg_run = 1.0  # seconds, moving average of job run time
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "expired": 0}
+
+    def start(self):
+        """Create the job queue and spawn its workers; no-op when they are already running"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.settings["max_queue"])
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.settings["workers"])]
+
+    async def shutdown(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            start = time.monotonic()
+            try:
+                result = await self.handler(**job.params)
+                if result.get("status") == "error":
+                    self._finish(job, error=result.get("message", "Verification failed"))
+                else:
+                    self._finish(job, result=result)
+            except asyncio.CancelledError:
+                self._finish(job, error="Server shutting down")
+                raise
+            except Exception as e:
+                self._finish(job, error=str(e))
+            finally:
+                self._avg_run = 0.9 * self._avg_run + 0.1 * (time.monotonic() - start)
+                self._queue.task_done()
+
+    def _finish(self, job: Job, result: Optional[Dict] = None, error: Optional[str] = None):
+        job.status = "error" if error is not None else "done"
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        self.counters["failed" if error is not None else "completed"] += 1
+        self._finished[job.id] = job.finished_at + self.settings["result_ttl"]
+        job.finished.set()
+
+    def _purge_expired(self):
+        now = time.time()
+        while self._finished:
+            job_id, expires_at = next(iter(self._finished.items()))
+            if expires_at > now:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+            self.counters["expired"] += 1
+
+    def retry_after(self) -> int:
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return max(1, round(self._avg_run * queued / self.settings["workers"]))
+
+    def submit(self, **params) -> Job:
+        self.start()
+        self._purge_expired()
+        job = Job(params)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise JobQueueFull(self.retry_after())
+        self._jobs[job.id] = job
+        self.counters["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Long-poll: return once the job has finished or timeout seconds have passed"""
+        if timeout > 0 and not job.finished.is_set():
+            try:
+                await asyncio.wait_for(job.finished.wait(), min(timeout, self.settings["max_wait"]))
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "retained": len(self._jobs)
+        }
+
+verification_jobs = JobManager(verify_claim)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")  # Google API daily quotas reset at Pacific midnight
+except Exception:
+    QUOTA_TIMEZONE = timezone.utc
+
+def quota_day() -> date:
+    return datetime.now(QUOTA_TIMEZONE).date()
+
+def seconds_until_quota_reset() -> float:
+    now = datetime.now(QUOTA_TIMEZONE)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=QUOTA_TIMEZONE)
+    return (midnight - now).total_seconds()
+
+class KeyState:
+    """Token bucket, daily usage and cooldown for one API key"""
+    def __init__(self, key: str, burst: float, now: float, day: date):
+        self.key = key
+        self.tokens = burst
+        self.updated = now
+        self.day = day
+        self.used_today = 0
+        self.cooldown_until = 0.0
+        self.counters = {"requests": 0, "errors": 0, "quota_errors": 0}
+
+    @property
+    def label(self) -> str:
+        return f"...{self.key[-4:]}"
+
+class KeyScheduler:
+    """
+    Spreads queries across API keys. Each key has a token bucket refilled at
+    rate per second, a daily quota, and a cooldown after rate-limit or quota
+    errors. acquire() returns None only once every key is exhausted.
+    """
+    def __init__(self, keys: List[str], rate: float, burst: float, daily_quota: int, cooldown: float,
+                 clock: Callable[[], float] = time.monotonic, day: Callable[[], date] = quota_day):
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.cooldown = cooldown
+        self._clock = clock
+        self._day = day
+        now = clock()
+        self.keys = [KeyState(key, burst, now, day()) for key in keys]
+
+    def _refresh(self, state: KeyState, now: float, today: date):
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+        state.updated = now
+        if state.day != today:
+            state.day = today
+            state.used_today = 0
+
+    def _usable(self, state: KeyState, now: float) -> bool:
+        return state.cooldown_until <= now and state.used_today < self.daily_quota
+
+    def try_acquire(self) -> Optional[KeyState]:
+        """Take a token from the least-used usable key that has one"""
+        now, today = self._clock(), self._day()
+        ready = []
+        for state in self.keys:
+            self._refresh(state, now, today)
+            if self._usable(state, now) and state.tokens >= 1:
+                ready.append(state)
+        if not ready:
+            return None
+        state = min(ready, key=lambda s: s.used_today)
+        state.tokens -= 1
+        state.used_today += 1
+        state.counters["requests"] += 1
+        return state
+
+    def next_available_in(self) -> Optional[float]:
+        """Seconds until some key can serve a query, or None if every key is exhausted"""
+        now = self._clock()
+        waits = []
+        for state in self.keys:
+            if state.used_today >= self.daily_quota:
+                continue
+            token_wait = max(0.0, (1 - state.tokens) / self.rate)
+            waits.append(max(token_wait, state.cooldown_until - now))
+        return min(waits) if waits else None
+
+    async def acquire(self, max_wait: float) -> Optional[KeyState]:
+        """Wait up to max_wait seconds for a key token; None if no key frees up in time"""
+        deadline = self._clock() + max_wait
+        while True:
+            state = self.try_acquire()
+            if state is not None:
+                return state
+            wait = self.next_available_in()
+            if wait is None or self._clock() + wait > deadline:
+                return None
+            await asyncio.sleep(max(wait, 0.001))
+
+    def report_error(self, state: KeyState):
+        state.counters["errors"] += 1
+
+    def report_quota_error(self, state: KeyState, daily: bool):
+        """Rest a key after a 429/403 quota response: until quota reset if daily, else for the cooldown"""
+        state.counters["quota_errors"] += 1
+        rest = seconds_until_quota_reset() if daily else self.cooldown
+        state.cooldown_until = self._clock() + rest
+
+    def all_exhausted(self) -> bool:
+        now = self._clock()
+        return not any(self._usable(state, now) for state in self.keys)
+
+    def stats(self) -> Dict[str, Dict]:
+        now = self._clock()
+        return {
+            state.label: {
+                **state.counters,
+                "used_today": state.used_today,
+                "remaining_today": max(0, self.daily_quota - state.used_today),
+                "cooling_down_for": round(max(0.0, state.cooldown_until - now), 1)
+            }
+            for state in self.keys
+        }
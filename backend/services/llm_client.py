@@ -0,0 +1,223 @@
+import asyncio
+import json
+import time
+import aiohttp
+from typing import AsyncIterator, Dict, Optional
+from utils.config import GPT_API_KEY, GPT_API_URL, LLM_CLIENT_SETTINGS, LLM_RESILIENCE_SETTINGS
+from utils.resilience import CircuitBreaker, LatencyTracker, backoff_delay, hedged
+
+class LLMError(Exception):
+    """Raised when the LLM upstream does not return a usable response"""
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the upstream while the circuit breaker is open"""
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+class LLMClient:
+    """
+    App-lifetime HTTP client for OpenAI chat completions.
+    One keep-alive connection pool is shared by every LLM call path. Completions
+    run under a per-call deadline with jittered retries on 429/5xx and timeouts,
+    behind a circuit breaker, optionally hedged at the rolling latency percentile.
+    """
+    def __init__(self, settings: Optional[Dict] = None, resilience: Optional[Dict] = None):
+        self.settings = settings or LLM_CLIENT_SETTINGS
+        self.resilience = resilience or LLM_RESILIENCE_SETTINGS
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.breaker = CircuitBreaker(
+            self.resilience["breaker_failure_threshold"],
+            self.resilience["breaker_reset_timeout"]
+        )
+        self.latency = LatencyTracker(self.resilience["latency_window"])
+        self.counters = {"calls": 0, "attempts": 0, "retries": 0, "hedged": 0, "failures": 0, "short_circuited": 0}
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Return the shared OpenAI session, opening a new pool if none is open or it was closed"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.settings["pool_size"],
+                limit_per_host=self.settings["per_host_limit"],
+                keepalive_timeout=self.settings["keepalive_timeout"]
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=None,
+                connect=self.settings["connect_timeout"],
+                sock_read=self.settings["read_timeout"]
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {api_key or GPT_API_KEY}",
+            "Content-Type": "application/json"
+        }
+
+    def _is_retryable(self, error: LLMError) -> bool:
+        # status None means a timeout or connection error
+        return error.status is None or error.status in self.resilience["retry_statuses"]
+
+    def _check_breaker(self) -> bool:
+        """Raise CircuitOpenError unless the breaker admits the call; True when it is the half-open probe"""
+        admitted, probe = self.breaker.acquire()
+        if not admitted:
+            self.counters["short_circuited"] += 1
+            raise CircuitOpenError("GPT circuit breaker is open", retry_after=self.breaker.retry_after())
+        return probe
+
+    async def _request(self, payload: Dict, api_key: Optional[str]) -> Dict:
+        session = await self.start()
+        async with session.post(GPT_API_URL, headers=self._headers(api_key), json=payload) as response:
+            if response.status != 200:
+                raise LLMError(
+                    f"GPT request failed with status {response.status}",
+                    status=response.status,
+                    retry_after=_retry_after(response)
+                )
+            return await response.json()
+
+    async def _post(self, payload: Dict, api_key: Optional[str], timeout: float) -> Dict:
+        """One completion attempt, bounded by timeout seconds"""
+        self.counters["attempts"] += 1
+        start = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(self._request(payload, api_key), timeout)
+        except asyncio.TimeoutError as e:
+            raise LLMError("GPT request timed out") from e
+        except aiohttp.ClientError as e:
+            raise LLMError(f"GPT connection error: {str(e)}") from e
+        self.latency.record(time.perf_counter() - start)
+        return data
+
+    async def _attempt(self, payload: Dict, api_key: Optional[str], timeout: float) -> Dict:
+        hedge_after = None
+        if self.resilience["hedge"]:
+            hedge_after = self.latency.percentile(
+                self.resilience["hedge_percentile"], self.resilience["hedge_min_samples"]
+            )
+        if hedge_after is None or hedge_after >= timeout:
+            return await self._post(payload, api_key, timeout)
+
+        attempts = iter([timeout, timeout - hedge_after])
+
+        def post():
+            attempt_timeout = next(attempts)
+            if attempt_timeout < timeout:
+                self.counters["hedged"] += 1
+            return self._post(payload, api_key, attempt_timeout)
+
+        return await hedged(post, hedge_after)
+
+    async def chat_completion(self, payload: Dict, api_key: Optional[str] = None, deadline: Optional[float] = None) -> Dict:
+        """
+        Send a chat completion request and return the decoded JSON body. Raises
+        LLMError once the deadline (seconds, default LLM_RESILIENCE_SETTINGS["deadline"])
+        or the retry budget runs out, and CircuitOpenError while the upstream is unhealthy.
+        """
+        self.counters["calls"] += 1
+        probe = self._check_breaker()
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.resilience["deadline"])
+        attempt = 0
+        try:
+            while True:
+                remaining = deadline_at - loop.time()
+                try:
+                    result = await self._attempt(payload, api_key, min(remaining, self.resilience["attempt_timeout"]))
+                except LLMError as e:
+                    if not self._is_retryable(e):
+                        # 4xx other than 429 are request or credential problems, not upstream health
+                        self.breaker.record_success()
+                        self.counters["failures"] += 1
+                        raise
+                    self.breaker.record_failure()
+                    # The failure settled any probe this call held
+                    probe = False
+                    delay = backoff_delay(attempt, self.resilience["backoff_base"], self.resilience["backoff_cap"])
+                    if e.retry_after is not None:
+                        delay = max(delay, e.retry_after)
+                    attempt += 1
+                    if attempt > self.resilience["max_retries"] or loop.time() + delay >= deadline_at:
+                        self.counters["failures"] += 1
+                        raise
+                    self.counters["retries"] += 1
+                    await asyncio.sleep(delay)
+                    probe = self._check_breaker()
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            # A cancelled probe must not hold the half-open slot
+            if probe:
+                self.breaker.release()
+
+    async def stream_chat_completion(self, payload: Dict, api_key: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Send a streaming chat completion request and yield content deltas as they arrive.
+        Streams go through the circuit breaker but are not retried: deltas may already
+        have reached the caller.
+        """
+        probe = self._check_breaker()
+        try:
+            session = await self.start()
+            async with session.post(GPT_API_URL, headers=self._headers(api_key), json={**payload, "stream": True}) as response:
+                if response.status != 200:
+                    error = LLMError(f"GPT request failed with status {response.status}", status=response.status)
+                    if self._is_retryable(error):
+                        self.breaker.record_failure()
+                    raise error
+                # Server-sent events: one "data: {...}" line per chunk, terminated by "data: [DONE]"
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if not data:
+                        continue
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError as e:
+                        self.breaker.record_failure()
+                        raise LLMError("GPT stream sent a malformed chunk") from e
+                    choices = chunk.get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            raise LLMError("GPT request timed out") from e
+        except aiohttp.ClientError as e:
+            self.breaker.record_failure()
+            raise LLMError(f"GPT connection error: {str(e)}") from e
+        finally:
+            # A probe whose consumer stops reading early must not hold the half-open slot
+            if probe:
+                self.breaker.release()
+        self.breaker.record_success()
+
+    def stats(self) -> Dict:
+        p95 = self.latency.percentile(0.95)
+        return {
+            **self.counters,
+            "breaker": self.breaker.stats(),
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+llm_client = LLMClient()
@@ -1,18 +1,14 @@
 import json
-import aiohttp
-from typing import Dict, List, Any
-from utils.config import GPT_API_KEY, GPT_API_URL
-from services.news_retrieval import detect_politicians, POLITICIAN_INFO, fetch_articles
+from typing import AsyncIterator, Dict, List, Any, Literal, Optional, Tuple
+from pydantic import BaseModel, field_validator
+from services.llm_client import llm_client, LLMError
+from utils.config import STRUCTURED_OUTPUT_SETTINGS
+from services.news_retrieval import detect_politicians, get_politician_info, fetch_articles
 from datetime import datetime
 
 async def analyze_politician_claim(text: str, politicians: List[str]) -> Dict[str, Any]:
-    headers = {
-        "Authorization": f"Bearer {GPT_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     # Get politician context
-    politician_contexts = [POLITICIAN_INFO.get(p, {}) for p in politicians]
+    politician_contexts = [get_politician_info(p) for p in politicians]
     
     system_prompt = {
         "role": "system",
@@ -41,22 +37,117 @@ async def analyze_politician_claim(text: str, politicians: List[str]) -> Dict[st
         "temperature": 0.3
     }
     
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GPT_API_URL, headers=headers, json=payload) as response:
-            result = await response.json()
-            analysis = result["choices"][0]["message"]["content"]
-            
-            return {
-                "is_claim": "true" in analysis.lower(),
-                "analysis": analysis
-            }
+    result = await llm_client.chat_completion(payload)
+    analysis = result["choices"][0]["message"]["content"]
+    
+    return {
+        "is_claim": "true" in analysis.lower(),
+        "analysis": analysis
+    }
 
-async def get_gpt_fact_check(text: str) -> Dict:
-    headers = {
-        "Authorization": f"Bearer {GPT_API_KEY}",
-        "Content-Type": "application/json"
+FACT_CHECK_CLASSIFICATIONS = ['TRUE', 'FALSE', 'MISLEADING', 'UNVERIFIED']
+
+class FactCheckResult(BaseModel):
+    """
+    The validated fact-check every consumer receives (/verify, /fact-check, /highlight
+    and the verdict cache), whether the model answered through the function call or
+    in the free-text format.
+    """
+    is_claim: bool = True
+    classification: Literal['TRUE', 'FALSE', 'MISLEADING', 'UNVERIFIED'] = "UNVERIFIED"
+    explanation: str = ""
+    evidence: List[str] = []
+    sources: List[str] = []
+    unverified_reason: str = ""
+
+    @field_validator("classification", mode="before")
+    @classmethod
+    def _normalize_classification(cls, value):
+        # Non-claims may leave the classification empty
+        return (value.strip().upper() or "UNVERIFIED") if isinstance(value, str) else value
+
+    def to_result(self, analysis: str) -> Dict:
+        return {"status": "success", **self.model_dump(), "analysis": analysis}
+
+FACT_CHECK_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "report_fact_check",
+        "description": "Report the fact-check verdict for the text",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "is_claim": {"type": "boolean", "description": "Is this a verifiable political claim?"},
+                "classification": {"type": "string", "enum": FACT_CHECK_CLASSIFICATIONS},
+                "explanation": {"type": "string", "description": "Clear and concise explanation, max 1500 characters"},
+                "evidence": {"type": "array", "items": {"type": "string"}, "description": "Supporting or refuting evidence"},
+                "sources": {"type": "array", "items": {"type": "string"}, "description": "Source name with URL"},
+                "unverified_reason": {"type": "string", "description": "Why the claim cannot be verified, if UNVERIFIED"}
+            },
+            "required": ["is_claim", "classification", "explanation", "sources"]
+        }
     }
-    
+}
+
+structured_output_counters = {"calls": 0, "repairs": 0, "failures": 0}
+
+def parse_structured_fact_check(message: Dict) -> Tuple[FactCheckResult, str]:
+    """
+    Validate the report_fact_check arguments of a completion message in one pass.
+    Raises ValueError (pydantic's ValidationError included) on malformed output.
+    """
+    tool_calls = message.get("tool_calls") or []
+    # Some responses put the JSON in the content instead of a tool call
+    arguments = tool_calls[0]["function"]["arguments"] if tool_calls else (message.get("content") or "")
+    return FactCheckResult.model_validate_json(arguments), arguments
+
+async def _structured_fact_check(messages: List[Dict]) -> Dict:
+    """
+    Fact check through the report_fact_check function call. Malformed arguments are
+    sent back to the model with the validation error, at most
+    STRUCTURED_OUTPUT_SETTINGS["max_repairs"] times.
+    """
+    payload = {
+        "model": "gpt-3.5-turbo",
+        "messages": messages,
+        "tools": [FACT_CHECK_TOOL],
+        "tool_choice": {"type": "function", "function": {"name": "report_fact_check"}},
+        "temperature": 0.3,
+        "max_tokens": 1500
+    }
+    structured_output_counters["calls"] += 1
+    for attempt in range(STRUCTURED_OUTPUT_SETTINGS["max_repairs"] + 1):
+        try:
+            data = await llm_client.chat_completion(payload)
+        except LLMError:
+            return {"status": "error", "message": "Failed to get response from GPT"}
+
+        message = data["choices"][0]["message"]
+        try:
+            result, arguments = parse_structured_fact_check(message)
+            return result.to_result(arguments)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            error = str(e)
+            raw = json.dumps(message.get("tool_calls") or message.get("content"))
+        if attempt < STRUCTURED_OUTPUT_SETTINGS["max_repairs"]:
+            structured_output_counters["repairs"] += 1
+            payload = {**payload, "messages": messages + [{
+                "role": "user",
+                "content": f"Your previous answer was invalid: {error}\nPrevious answer: {raw}\n"
+                           "Call report_fact_check again with arguments matching its schema."
+            }]}
+
+    structured_output_counters["failures"] += 1
+    return {
+        "status": "error",
+        "message": f"Failed to parse response: {error}",
+        "raw_content": raw
+    }
+
+def structured_output_stats() -> Dict:
+    return dict(structured_output_counters)
+
+def _fact_check_payload(text: str) -> Dict:
     system_prompt = {
         "role": "system",
         "content": """You are an expert Filipino fact-checker. Format your response exactly like this:
@@ -77,7 +168,7 @@ async def get_gpt_fact_check(text: str) -> Dict:
         Use only these classifications: TRUE, FALSE, MISLEADING, UNVERIFIED"""
     }
     
-    payload = {
+    return {
         "model": "gpt-3.5-turbo",
         "messages": [
             system_prompt,
@@ -86,65 +177,164 @@ async def get_gpt_fact_check(text: str) -> Dict:
         "temperature": 0.3,
         "max_tokens": 1500
     }
+
+def parse_fact_check(content: str) -> Dict:
+    """Parse a fact-check completion into classification, explanation and sources"""
+    try:
+        # Extract classification and explanation
+        lines = content.split('\n')
+        classification = None
+        explanation = ""
+        sources = []
+        unverified_reason = ""
+        
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if '!' in line and not classification:
+                # Look for any of the expected classifications
+                for expected in FACT_CHECK_CLASSIFICATIONS:
+                    if expected in line:
+                        classification = expected
+                        # Get the explanation from the next line
+                        if i + 1 < len(lines):
+                            explanation = lines[i + 1].strip()
+                        break
+            elif line.startswith('Sources:'):
+                # Collect sources
+                sources = [s.strip() for s in lines[i+1:] if s.strip()]
+            elif classification == "UNVERIFIED" and line.startswith('-'):
+                unverified_reason += f"{line}\n"
+        
+        return FactCheckResult(
+            classification=classification or "UNVERIFIED",
+            explanation=explanation,
+            sources=sources,
+            unverified_reason=unverified_reason.strip()
+        ).to_result(content)
+    except Exception as e:
+        return {
+            "status": "error", 
+            "message": f"Failed to parse response: {str(e)}",
+            "raw_content": content
+        }
+
+async def get_gpt_fact_check(text: str) -> Dict:
+    if STRUCTURED_OUTPUT_SETTINGS["enabled"]:
+        return await _structured_fact_check([
+            {
+                "role": "system",
+                "content": """You are an expert Filipino fact-checker. Fact check the claim and report
+                your verdict by calling report_fact_check. Use UNVERIFIED when there is a lack of
+                credible sources, insufficient evidence, an ongoing investigation, contradicting
+                information or time-sensitive/outdated information, and say which in unverified_reason."""
+            },
+            {"role": "user", "content": f"Fact check this claim: {text}"}
+        ])
+
+    try:
+        data = await llm_client.chat_completion(_fact_check_payload(text))
+    except LLMError:
+        return {"status": "error", "message": "Failed to get response from GPT"}
     
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GPT_API_URL, headers=headers, json=payload) as response:
-            if response.status != 200:
-                return {"status": "error", "message": "Failed to get response from GPT"}
-            
-            data = await response.json()
-            content = data["choices"][0]["message"]["content"]
-            
-            try:
-                # Extract classification and explanation
-                lines = content.split('\n')
-                classification = None
-                explanation = ""
-                sources = []
-                unverified_reason = ""
-                
-                for i, line in enumerate(lines):
-                    line = line.strip()
-                    if '!' in line and not classification:
-                        # Look for any of the expected classifications
-                        for expected in ['TRUE', 'FALSE', 'MISLEADING', 'UNVERIFIED']:
-                            if expected in line:
-                                classification = expected
-                                # Get the explanation from the next line
-                                if i + 1 < len(lines):
-                                    explanation = lines[i + 1].strip()
-                                break
-                    elif line.startswith('Sources:'):
-                        # Collect sources
-                        sources = [s.strip() for s in lines[i+1:] if s.strip()]
-                    elif classification == "UNVERIFIED" and line.startswith('-'):
-                        unverified_reason += f"{line}\n"
-                
-                if not classification:
-                    classification = "UNVERIFIED"
-                
-                return {
-                    "status": "success",
-                    "classification": classification,
-                    "explanation": explanation,
-                    "sources": sources,
-                    "unverified_reason": unverified_reason.strip(),
-                    "analysis": content
-                }
-            except Exception as e:
-                return {
-                    "status": "error", 
-                    "message": f"Failed to parse response: {str(e)}",
-                    "raw_content": content
-                }
-
-async def get_gpt_chat_response(message: str, context: str = None) -> str:
-    """Handle chat interactions with GPT model"""
-    headers = {
-        "Authorization": f"Bearer {GPT_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    return parse_fact_check(data["choices"][0]["message"]["content"])
+
+async def get_fused_claim_check(text: str, politicians: List[str]) -> Dict:
+    """
+    One LLM round trip that decides whether the text is a verifiable claim and,
+    if it is, returns the verdict. Replaces analyze_politician_claim followed by
+    get_gpt_fact_check.
+    """
+    politician_contexts = [get_politician_info(p) for p in politicians]
     
+    return await _structured_fact_check([
+        {
+            "role": "system",
+            "content": """You are an expert Filipino fact-checker. Decide whether the text is a
+            verifiable political claim and, if it is, fact check it. Report by calling
+            report_fact_check. If is_claim is false, leave explanation, evidence and sources empty."""
+        },
+        {"role": "user", "content": f"""Claim about politicians {', '.join(politicians)}: {text}
+        
+        Politician Context:
+        {json.dumps(politician_contexts, indent=2)}"""}
+    ])
+
+class FactCheckStreamParser:
+    """
+    Incremental parser for a streamed fact-check completion.
+    feed() turns content deltas into events as soon as they can be decided:
+    "classification" once the THIS IS ...! line is complete, then "explanation"
+    text as it arrives, then one "source" event per source line. close() emits
+    a final "done" event carrying the same result parse_fact_check() returns.
+    """
+    def __init__(self):
+        self.content = ""
+        self.classification: Optional[str] = None
+        self.section = "header"
+        self._line = ""
+        self._emitted = 0
+
+    def feed(self, delta: str) -> List[Dict]:
+        events = []
+        self.content += delta
+        self._line += delta
+        while '\n' in self._line:
+            line, self._line = self._line.split('\n', 1)
+            self._finish_line(line, events)
+            self._emitted = 0
+        if self.section == "explanation":
+            self._emit_partial(self._line, events)
+        return events
+
+    def close(self) -> List[Dict]:
+        events = []
+        if self._line:
+            self._finish_line(self._line, events)
+            self._line = ""
+        events.append({"event": "done", "data": parse_fact_check(self.content)})
+        return events
+
+    def _emit_partial(self, line: str, events: List[Dict]):
+        stripped = line.strip()
+        # Hold back text that may still turn out to be the "Sources:" header
+        if not stripped or 'Sources:'.startswith(stripped) or stripped.startswith('Sources:'):
+            return
+        if len(line) > self._emitted:
+            events.append({"event": "explanation", "data": {"text": line[self._emitted:]}})
+            self._emitted = len(line)
+
+    def _finish_line(self, line: str, events: List[Dict]):
+        stripped = line.strip()
+        if self.classification is None:
+            if '!' in stripped:
+                for expected in FACT_CHECK_CLASSIFICATIONS:
+                    if expected in stripped:
+                        self.classification = expected
+                        self.section = "explanation"
+                        events.append({"event": "classification", "data": {"classification": expected}})
+                        break
+            return
+        if stripped.startswith('Sources:'):
+            self.section = "sources"
+        elif self.section == "explanation":
+            self._emit_partial(line + '\n', events)
+        elif self.section == "sources" and stripped:
+            events.append({"event": "source", "data": {"source": stripped}})
+
+async def stream_gpt_fact_check(text: str) -> AsyncIterator[Dict]:
+    """Stream a fact check as events: classification, explanation, source, then done or error"""
+    parser = FactCheckStreamParser()
+    try:
+        async for delta in llm_client.stream_chat_completion(_fact_check_payload(text)):
+            for event in parser.feed(delta):
+                yield event
+    except LLMError:
+        yield {"event": "error", "data": {"message": "Failed to get response from GPT"}}
+        return
+    for event in parser.close():
+        yield event
+
+def _chat_payload(message: str, context: str = None, history: Optional[List[Dict]] = None) -> Dict:
     messages = [
         {
             "role": "system",
@@ -155,18 +345,61 @@ async def get_gpt_chat_response(message: str, context: str = None) -> str:
     if context:
         messages.append({"role": "user", "content": f"Context: {context}"})
     
+    # Earlier turns of a server-side chat session, already fitted to its token budget
+    messages.extend(history or [])
     messages.append({"role": "user", "content": message})
     
-    payload = {
+    return {
         "model": "gpt-3.5-turbo",
         "messages": messages,
         "temperature": 0.7,
         "max_tokens": 1000
     }
-    
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GPT_API_URL, headers=headers, json=payload) as response:
-            if response.status != 200:
-                return "THIS IS ERROR! Failed to get response."
-            data = await response.json()
-            return data["choices"][0]["message"]["content"]
\ No newline at end of file
+
+# Returned by get_gpt_chat_response (and sent as the stream error message) when the LLM call fails
+CHAT_ERROR = "THIS IS ERROR! Failed to get response."
+
+async def get_gpt_chat_response(message: str, context: str = None, history: Optional[List[Dict]] = None) -> str:
+    """Handle chat interactions with GPT model; returns CHAT_ERROR when the LLM call fails"""
+    try:
+        data = await llm_client.chat_completion(_chat_payload(message, context, history))
+    except LLMError:
+        return CHAT_ERROR
+    return data["choices"][0]["message"]["content"]
+
+async def stream_gpt_chat_response(message: str, context: str = None, history: Optional[List[Dict]] = None) -> AsyncIterator[Dict]:
+    """Stream a chat answer as token events, then done or error"""
+    response = ""
+    try:
+        async for delta in llm_client.stream_chat_completion(_chat_payload(message, context, history)):
+            response += delta
+            yield {"event": "token", "data": {"text": delta}}
+    except LLMError:
+        yield {"event": "error", "data": {"message": CHAT_ERROR}}
+        return
+    yield {"event": "done", "data": {"response": response}}
+
+async def summarize_chat_history(summary: str, turns: List[Dict], max_tokens: int) -> Optional[str]:
+    """
+    Fold older chat turns into a running summary, so a session's history stays
+    within its token budget. Returns None when the LLM call fails.
+    """
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+    payload = {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {
+                "role": "system",
+                "content": "Summarize this fact-checking conversation briefly. Keep every claim, verdict, "
+                           "source and open question the user raised."
+            },
+            {"role": "user", "content": f"Summary so far: {summary or '(none)'}\n\nNew turns:\n{transcript}"}
+        ],
+        "temperature": 0.2,
+        "max_tokens": max_tokens
+    }
+    try:
+        data = await llm_client.chat_completion(payload)
+    except LLMError:
+        return None
+    return data["choices"][0]["message"]["content"].strip()
\ No newline at end of file
@@ -1,6 +1,12 @@
+import asyncio
+import hashlib
 import re
 from services.google_service import search_manager  # Correct import
-from typing import List, Dict
+from services.politician_matcher import PoliticianMatcher, PoliticianMatch
+from utils.cache import TieredCache
+from utils.single_flight import SingleFlight
+from utils.config import SEARCH_CACHE_SETTINGS, EVIDENCE_SETTINGS, get_source_domains
+from typing import List, Dict, Optional
 
 POLITICIANS = [
     "Bongbong Marcos",
@@ -22,7 +28,6 @@ POLITICIANS = [
     "Rodrigo Duterte",
     "Greco Belgica",
     "Lito Monico Lorenzana",
-    "Joseph Estrada",
     "Frederick Siao",
     "Paolo Duterte",
     "Seth Frederick Jalosjos",
@@ -54,6 +59,17 @@ POLITICIANS = [
     "BBM"
 ]
 
+# Nicknames and former names resolved to one canonical name
+POLITICIAN_ALIASES = {
+    "BBM": "Ferdinand Marcos Jr.",
+    "Bongbong Marcos": "Ferdinand Marcos Jr.",
+    "Noynoy Aquino": "Benigno Aquino III",
+    "GMA": "Gloria Macapagal Arroyo",
+    "Chiz Escudero": "Francis Escudero",
+    "Ping Lacson": "Panfilo Lacson",
+    "Dick Gordon": "Richard Gordon"
+}
+
 POLITICIAN_INFO = {
     "Bongbong Marcos": {
         "party": "Partido Federal ng Pilipinas",
@@ -212,12 +228,128 @@ POLITICIAN_INFO = {
         "position": "Party Leader"
     },
 }
+def get_canonical_name(politician: str) -> str:
+    return POLITICIAN_ALIASES.get(politician, politician)
+
+# POLITICIAN_INFO is keyed on surface names; index it by canonical name as well
+_INFO_BY_CANONICAL = {get_canonical_name(name): info for name, info in POLITICIAN_INFO.items()}
+
+def get_politician_info(politician: str) -> Dict:
+    """Party and position for a politician, by surface or canonical name"""
+    return POLITICIAN_INFO.get(politician) or _INFO_BY_CANONICAL.get(politician, {})
+
+politician_matcher = PoliticianMatcher(POLITICIANS, POLITICIAN_ALIASES)
+
+def find_politicians(text: str) -> List[PoliticianMatch]:
+    """Politician mentions with canonical names and character offsets"""
+    return politician_matcher.find_all(text)
+
 def detect_politicians(text: str) -> List[str]:
-    """Detect politicians mentioned in the text"""
-    mentioned_politicians = [politician for politician in POLITICIANS if politician in text]
-    return mentioned_politicians
+    """Detect politicians mentioned in the text (canonical names, de-duplicated)"""
+    return politician_matcher.detect(text)
+
+search_cache = TieredCache(
+    "search_results",
+    max_entries=SEARCH_CACHE_SETTINGS["max_entries"],
+    ttl=SEARCH_CACHE_SETTINGS["ttl"]["news"],
+    sqlite_path=SEARCH_CACHE_SETTINGS["sqlite_path"]
+)
+
+# Identical concurrent searches and background refreshes share one API call
+search_flight = SingleFlight()
+_refresh_tasks = set()
 
-async def fetch_articles(query: str) -> Dict:
-    """Fetch articles related to the query"""
-    search_results = await search_manager._api_search(query, "news")
+def search_cache_key(query: str, search_type: str) -> str:
+    normalized = re.sub(r"\s+", " ", query.casefold()).strip()
+    return f"{search_type}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+async def _search_and_cache(query: str, search_type: str, key: str) -> Optional[Dict]:
+    search_results = await search_manager._api_search(query, search_type)
+    # Only real search results are cached, not failures or GPT-generated fallbacks
+    if search_results is not None and "items" in search_results:
+        ttl = SEARCH_CACHE_SETTINGS["ttl"].get(search_type, SEARCH_CACHE_SETTINGS["ttl"]["news"])
+        search_cache.set(key, search_results, ttl=ttl)
     return search_results
+
+def _refresh_in_background(query: str, search_type: str, key: str):
+    task = asyncio.ensure_future(search_flight.do(key, lambda: _search_and_cache(query, search_type, key)))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+async def fetch_articles(query: str, search_type: str = "news") -> Dict:
+    """Fetch articles related to the query, reading through the search result cache"""
+    key = search_cache_key(query, search_type)
+    max_stale = SEARCH_CACHE_SETTINGS["stale_ttl"] if SEARCH_CACHE_SETTINGS["stale_while_revalidate"] else 0
+    entry = search_cache.get_entry(key, max_stale=max_stale)
+    if entry is not None:
+        search_results, fresh = entry
+        if not fresh:
+            _refresh_in_background(query, search_type, key)
+        return search_results
+    return await search_flight.do(key, lambda: _search_and_cache(query, search_type, key))
+
+evidence_counters = {"requests": 0, "tier_results": 0, "tier_timeouts": 0, "tier_errors": 0, "duplicates": 0}
+
+def _url_key(url: str) -> str:
+    """Dedup key for a result URL: no scheme, fragment or trailing slash, lowercase host"""
+    url = url.split("#", 1)[0].split("://", 1)[-1]
+    host, slash, path = url.partition("/")
+    return host.lower().removeprefix("www.") + slash + path.rstrip("/")
+
+def tier_query(query: str, tier: str) -> str:
+    """Restrict a query to one source tier's domains with site: operators"""
+    return f"{query} ({' OR '.join(get_source_domains(tier))})"
+
+async def _search_tier(query: str, tier: str, settings: Dict) -> List[Dict]:
+    try:
+        # A tier that times out here keeps searching behind the single-flight, so its
+        # results still land in the search cache for the next request
+        results = await asyncio.wait_for(fetch_articles(tier_query(query, tier), tier), settings["timeout"])
+    except asyncio.TimeoutError:
+        evidence_counters["tier_timeouts"] += 1
+        raise
+    except Exception as e:
+        print(f"Evidence retrieval failed for {tier}: {str(e)}")
+        evidence_counters["tier_errors"] += 1
+        raise
+    evidence_counters["tier_results"] += 1
+    return (results or {}).get("items", [])[:settings["max_results"]]
+
+async def retrieve_evidence(query: str, deadline: Optional[float] = None) -> Dict:
+    """
+    Search the government, news and fact-check tiers concurrently, each with its own
+    timeout and result cap. Returns whatever arrived by the overall deadline as
+    official_sources, news_results and fact_checks buckets, plus every item merged
+    and de-duplicated by URL; tiers that missed the deadline or failed are listed
+    under "incomplete".
+    """
+    evidence_counters["requests"] += 1
+    tiers = EVIDENCE_SETTINGS["tiers"]
+    tasks = {tier: asyncio.ensure_future(_search_tier(query, tier, settings)) for tier, settings in tiers.items()}
+    await asyncio.wait(tasks.values(), timeout=deadline or EVIDENCE_SETTINGS["deadline"])
+
+    evidence = {settings["bucket"]: [] for settings in tiers.values()}
+    evidence["items"] = []
+    evidence["incomplete"] = []
+    seen = set()
+    for tier, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            evidence_counters["tier_timeouts"] += 1
+            evidence["incomplete"].append(tier)
+            continue
+        if task.cancelled() or task.exception() is not None:
+            evidence["incomplete"].append(tier)
+            continue
+        for item in task.result():
+            key = _url_key(item.get("link", ""))
+            if key in seen:
+                evidence_counters["duplicates"] += 1
+                continue
+            seen.add(key)
+            evidence[tiers[tier]["bucket"]].append(item)
+            evidence["items"].append(item)
+    return evidence
+
+def evidence_stats() -> Dict:
+    return dict(evidence_counters)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+class PoliticianMatch(NamedTuple):
+    name: str  # canonical name
+    text: str  # surface form as written in the post
+    start: int
+    end: int
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a character trie, so the engine walks
+    shared prefixes once instead of retrying every name at every position.
+    Longer names are tried before their prefixes.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A name ends here but longer names continue: make the tail optional
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+class PoliticianMatcher:
+    """
+    Single-pass politician matcher over one compiled pattern covering every
+    name and alias. Matches respect word boundaries, so "House" does not match
+    inside "Household", and overlapping names resolve to the longest one.
+    """
+    def __init__(self, names: Iterable[str], aliases: Optional[Dict[str, str]] = None, ignore_case: bool = False):
+        self.aliases = dict(aliases or {})
+        surface_forms = set(names) | set(self.aliases) | set(self.aliases.values())
+        flags = re.IGNORECASE if ignore_case else 0
+        self._lookup = {(form.casefold() if ignore_case else form): form for form in surface_forms}
+        self._ignore_case = ignore_case
+        body = _trie_pattern(surface_forms) if surface_forms else "(?!)"
+        self.pattern = re.compile(r"(?<!\w)" + body + r"(?!\w)", flags)
+
+    def canonical(self, name: str) -> str:
+        return self.aliases.get(name, name)
+
+    def find_all(self, text: str) -> List[PoliticianMatch]:
+        """Every mention in the text, with canonical name and character offsets"""
+        matches = []
+        for match in self.pattern.finditer(text):
+            surface = match.group(0)
+            form = self._lookup[surface.casefold()] if self._ignore_case else surface
+            matches.append(PoliticianMatch(self.canonical(form), surface, match.start(), match.end()))
+        return matches
+
+    def detect(self, text: str) -> List[str]:
+        """Canonical names mentioned in the text, de-duplicated, in order of first mention"""
+        return list(dict.fromkeys(match.name for match in self.find_all(text)))
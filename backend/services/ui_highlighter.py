@@ -1,23 +1,100 @@
 # ui_highlighter.py - Enhanced claim highlighting with Filipino language support
-from services.llm_service import get_gpt_fact_check, analyze_politician_claim  # Changed import
+import asyncio
+import html
+from typing import Dict, List
+from services.llm_service import get_gpt_fact_check, analyze_politician_claim, get_fused_claim_check  # Changed import
 from services.news_retrieval import detect_politicians
-import re
+from utils.claim_patterns import has_explicit_claim
+from utils.segmenter import split_sentences, SentenceSpan
+from utils.config import HIGHLIGHT_SETTINGS
+from utils.scheduler import llm_scheduler, SchedulerFull
+
+# Define color mapping for labels
+LABEL_COLORS = {
+    "FALSE": "red",
+    "MISLEADING": "orange",
+    "UNFOUNDED": "blue",
+    "UNVERIFIED": "blue",
+    "VERIFIED": "green",
+    "TRUE": "green",
+    "ERROR": "gray"
+}
+
+async def _two_stage_analysis(text: str, politicians: List[str]) -> Dict:
+    """
+    Claim detection and fact check as two LLM calls run concurrently.
+    The fact check is cancelled as soon as the claim stage says no.
+    """
+    claim_task = asyncio.ensure_future(analyze_politician_claim(text, politicians))
+    verdict_task = asyncio.ensure_future(get_gpt_fact_check(text))
+    try:
+        claim_analysis = await claim_task
+    except BaseException:
+        verdict_task.cancel()
+        raise
+    if not claim_analysis["is_claim"]:
+        verdict_task.cancel()
+        return {"status": "success", "is_claim": False}
+
+    analysis = await verdict_task
+    if analysis["status"] != "success":
+        return analysis
+    return {**analysis, "is_claim": True}
+
+async def _analyze(text: str, politicians: List[str]) -> Dict:
+    """Claim decision and verdict: one fused call, or two concurrent calls, in an interactive scheduler slot"""
+    async with llm_scheduler.slot("interactive"):
+        if HIGHLIGHT_SETTINGS["mode"] == "fused":
+            return await get_fused_claim_check(text, politicians)
+        return await _two_stage_analysis(text, politicians)
+
+def claim_spans(text: str) -> List[SentenceSpan]:
+    """
+    Claim-bearing sentences of a post: those mentioning a politician or using
+    explicit claim language. Capped at HIGHLIGHT_SETTINGS["max_spans"].
+    """
+    spans = [
+        span for span in split_sentences(text)
+        if detect_politicians(span.text) or has_explicit_claim(span.text)
+    ]
+    return spans[:HIGHLIGHT_SETTINGS["max_spans"]]
+
+def _annotation(span: SentenceSpan, analysis: Dict) -> Dict:
+    classification = analysis["classification"]
+    return {
+        "text": span.text,
+        "start": span.start,
+        "end": span.end,
+        "classification": classification,
+        "explanation": analysis["explanation"],
+        "evidence": analysis["evidence"],
+        "sources": analysis["sources"],
+        "color": LABEL_COLORS.get(classification, "gray")
+    }
+
+def _highlight_html(text: str, annotations: List[Dict]) -> str:
+    """Wrap each annotated span of the text in its underline class"""
+    parts = []
+    position = 0
+    for annotation in annotations:
+        parts.append(html.escape(text[position:annotation["start"]]))
+        parts.append(
+            f'<span class="underline-{annotation["color"]}">'
+            f'{html.escape(text[annotation["start"]:annotation["end"]])}</span>'
+        )
+        position = annotation["end"]
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
 
 async def highlight_claims(text):
     """
     Processes text, detects claims, and applies colored underlines based on fact-checking results.
     Supports both English and Filipino text.
-    Returns highlighted HTML and a list of annotations.
+    With HIGHLIGHT_SETTINGS["segment"], only claim-bearing sentences are sent to the
+    LLM, concurrently, and each annotation carries its character offsets.
+    Returns highlighted HTML and a list of annotations. Raises SchedulerFull when the
+    interactive queue is full.
     """
-    # Define color mapping for labels
-    label_colors = {
-        "FALSE": "red",
-        "MISLEADING": "orange",
-        "UNFOUNDED": "blue",
-        "VERIFIED": "green",
-        "ERROR": "gray"
-    }
-    
     try:
         # First detect politicians
         mentioned_politicians = detect_politicians(text)
@@ -25,52 +102,53 @@ async def highlight_claims(text):
             return {
                 "status": "no_politicians",
                 "message": "No politicians mentioned in text",
-                "highlighted_html": text,
+                "highlighted_html": html.escape(text),
                 "annotations": []
             }
 
-        # Check if it's a claim
-        claim_analysis = await analyze_politician_claim(text, mentioned_politicians)
-        if not claim_analysis["is_claim"]:
+        if HIGHLIGHT_SETTINGS["segment"]:
+            spans = claim_spans(text)
+        else:
+            spans = [SentenceSpan(0, len(text), text)]
+
+        analyses = await asyncio.gather(*(_analyze(span.text, mentioned_politicians) for span in spans))
+
+        failed = [analysis for analysis in analyses if analysis["status"] != "success"]
+        if failed and len(failed) == len(analyses):
             return {
-                "status": "no_claim",
-                "message": "No political claim detected",
-                "highlighted_html": text,
+                "status": "error",
+                "message": failed[0].get("message", "Analysis failed"),
+                "highlighted_html": html.escape(text),
                 "annotations": []
             }
 
-        # Get fact check analysis
-        analysis = await get_gpt_fact_check(text)
-        if analysis["status"] != "success":
+        annotations = [
+            _annotation(span, analysis)
+            for span, analysis in zip(spans, analyses)
+            if analysis["status"] == "success" and analysis["is_claim"]
+        ]
+        if not annotations:
             return {
-                "status": "error",
-                "message": analysis.get("message", "Analysis failed"),
-                "highlighted_html": text,
+                "status": "no_claim",
+                "message": "No political claim detected",
+                "highlighted_html": html.escape(text),
                 "annotations": []
             }
 
         # Create highlighted version with annotations
-        classification = analysis["analysis"]["classification"]
-        color = label_colors.get(classification, "gray")
-        
         return {
             "status": "success",
-            "highlighted_html": f'<span class="underline-{color}">{text}</span>',
-            "annotations": [{
-                "text": text,
-                "classification": classification,
-                "explanation": analysis["analysis"]["explanation"],
-                "evidence": analysis["analysis"]["evidence"],
-                "sources": analysis["analysis"]["sources"],
-                "color": color
-            }]
+            "highlighted_html": _highlight_html(text, annotations),
+            "annotations": annotations
         }
 
+    except SchedulerFull:
+        raise
     except Exception as e:
         print(f"Error in highlight_claims: {str(e)}")
         return {
             "status": "error",
             "message": str(e),
-            "highlighted_html": text,
+            "highlighted_html": html.escape(text),
             "annotations": []
         }
\ No newline at end of file
@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from utils.cache import TieredCache
+from utils.single_flight import SingleFlight
+from utils.claim_patterns import has_explicit_claim
+from utils.nlp_pool import nlp_pool, NLPPoolFull
+from utils.near_duplicate import NearDuplicateIndex, Signature
+from utils.scheduler import llm_scheduler, SchedulerFull, SlotTicket
+from utils.config import VERDICT_CACHE_SETTINGS, VERIFY_SETTINGS, GATE_SETTINGS, NEAR_DUPLICATE_SETTINGS, CASCADE_SETTINGS
+from services.llm_service import get_gpt_fact_check, stream_gpt_fact_check
+from services.news_retrieval import detect_politicians
+from services.factcheck_index import lookup_fact_check
+from services.cascade import nli_verdict
+
+verdict_cache = TieredCache(
+    "verdicts",
+    max_entries=VERDICT_CACHE_SETTINGS["max_entries"],
+    ttl=VERDICT_CACHE_SETTINGS["ttl"],
+    sqlite_path=VERDICT_CACHE_SETTINGS["sqlite_path"]
+)
+
+# Concurrent requests for the same claim share one LLM call
+verification_flight = SingleFlight()
+
+# Scheduler tickets of in-flight checks, so a caller joining a flight can raise its priority
+flight_tickets: Dict[str, SlotTicket] = {}
+
+# Texts of cached verdicts, so edited re-posts can reuse them
+near_duplicates = NearDuplicateIndex(
+    bands=NEAR_DUPLICATE_SETTINGS["bands"],
+    rows=NEAR_DUPLICATE_SETTINGS["rows"],
+    shingle_size=NEAR_DUPLICATE_SETTINGS["shingle_size"],
+    max_entries=NEAR_DUPLICATE_SETTINGS["max_entries"]
+)
+
+# Keys holding a reused copy of each source verdict, so invalidating the source drops the copies too
+reused_verdicts: "OrderedDict[str, Set[str]]" = OrderedDict()
+
+gate_counters = {"checked": 0, "passed": 0, "short_circuited": 0, "bypassed": 0}
+
+# Which stage answered each verification request
+tier_counters = {"gate": 0, "cache": 0, "near_duplicate": 0, "factcheck_index": 0, "nli": 0, "llm": 0}
+
+def normalize_claim(text: str) -> str:
+    """Normalize claim text so trivially different copies of a post share one key"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+def claim_key(text: str) -> str:
+    """Content address of a claim: SHA-256 of its normalized text"""
+    return hashlib.sha256(normalize_claim(text).encode("utf-8")).hexdigest()
+
+def invalidate_verdict(text: str) -> bool:
+    """
+    Drop the cached verdict for a claim, and every near-duplicate copy made of it,
+    so the next request re-checks it
+    """
+    key = claim_key(text)
+    near_duplicates.remove(key)
+    removed = verdict_cache.invalidate(key)
+    for reused_key in reused_verdicts.pop(key, ()):
+        removed = verdict_cache.invalidate(reused_key) or removed
+    return removed
+
+async def gate_claim(text: str, force: bool = False) -> Optional[Dict]:
+    """
+    Local pre-filter: returns a not_applicable result when the text has no
+    politician mention and no explicit claim language, or None when it needs a
+    fact check. Implicit signals (all, best, will, ...) alone do not pass.
+    """
+    if force or not GATE_SETTINGS["enabled"]:
+        gate_counters["bypassed"] += 1
+        return None
+    gate_counters["checked"] += 1
+    if detect_politicians(text) or has_explicit_claim(text):
+        gate_counters["passed"] += 1
+        return None
+    if GATE_SETTINGS["use_nlp"]:
+        try:
+            # NER only: detect_claim also accepts implicit words (all, best, will), which
+            # the gate excludes. The model runs in the NLP worker pool so the event loop never blocks
+            has_claim = await nlp_pool.has_named_entity(text)
+        except NLPPoolFull:
+            # Fail open: an overloaded or broken NLP pool must not hide real claims
+            has_claim = True
+        except Exception as e:
+            print(f"NLP gate failed: {str(e)}")
+            has_claim = True
+        if has_claim:
+            gate_counters["passed"] += 1
+            return None
+    gate_counters["short_circuited"] += 1
+    return {
+        "status": "not_applicable",
+        "classification": None,
+        "message": "No politician mention or claim detected"
+    }
+
+def gate_stats() -> Dict:
+    return dict(gate_counters)
+
+def tier_stats() -> Dict:
+    """Requests answered by each verification tier, as counts and as fractions of all requests"""
+    total = sum(tier_counters.values())
+    return {
+        "counts": dict(tier_counters),
+        "fractions": {tier: round(count / total, 4) if total else 0.0 for tier, count in tier_counters.items()}
+    }
+
+async def claim_signature(text: str) -> Optional[Signature]:
+    """
+    MinHash signature of a claim for near-duplicate lookup, or None when reuse is off.
+    Computed once per new claim, in a worker thread: it is pure-Python CPU work.
+    """
+    if not NEAR_DUPLICATE_SETTINGS["enabled"]:
+        return None
+    return await asyncio.to_thread(near_duplicates.signature, text)
+
+def _cache_verdict(key: str, result: Dict, signature: Optional[Signature]):
+    verdict_cache.set(key, result)
+    if signature is not None:
+        near_duplicates.add_signature(key, signature)
+
+def reuse_near_duplicate(key: str, signature: Optional[Signature]) -> Optional[Dict]:
+    """
+    The cached verdict of a previously checked, near-identical claim, marked with
+    reused_from (its claim key and similarity) so every reuse can be audited.
+    The reused verdict is also cached under this text's own key.
+    """
+    if signature is None:
+        return None
+    match = near_duplicates.query_signature(signature, NEAR_DUPLICATE_SETTINGS["threshold"])
+    if match is None:
+        return None
+    prior_key, similarity = match
+    prior = verdict_cache.get(prior_key)
+    if prior is None:
+        # The prior verdict expired or was invalidated
+        near_duplicates.remove(prior_key)
+        return None
+    result = {**prior, "reused_from": {"claim_key": prior_key, "similarity": round(similarity, 3)}}
+    print(f"Reusing verdict {prior_key[:12]} for near-duplicate claim {key[:12]} (similarity {similarity:.3f})")
+    verdict_cache.set(key, result)
+    _record_reuse(prior_key, key)
+    return result
+
+def _record_reuse(prior_key: str, key: str):
+    reused_verdicts.setdefault(prior_key, set()).add(key)
+    reused_verdicts.move_to_end(prior_key)
+    while len(reused_verdicts) > NEAR_DUPLICATE_SETTINGS["max_entries"]:
+        reused_verdicts.popitem(last=False)
+
+async def _local_verdict(text: str) -> Optional[Dict]:
+    """
+    Verdicts that need no LLM call: a published fact-check, then (in cascade mode)
+    the NLI model's confident verdict against retrieved evidence.
+    """
+    result = await lookup_fact_check(text)
+    if result is not None:
+        tier_counters["factcheck_index"] += 1
+        return result
+    if CASCADE_SETTINGS["enabled"]:
+        # nli_verdict counts its own failures and returns None to escalate to the LLM
+        result = await nli_verdict(text)
+        if result is not None:
+            tier_counters["nli"] += 1
+            return result
+    return None
+
+async def _check_and_cache(key: str, text: str, ticket: SlotTicket, signature: Optional[Signature]) -> Dict:
+    try:
+        result = await _local_verdict(text)
+        if result is None:
+            tier_counters["llm"] += 1
+            async with llm_scheduler.slot(ticket):
+                result = await get_gpt_fact_check(text)
+    finally:
+        flight_tickets.pop(key, None)
+    # Only successful verdicts are cached; errors are retried on the next request
+    if result.get("status") == "success":
+        _cache_verdict(key, result, signature)
+    return result
+
+async def verify_claim(text: str, force: bool = False, priority: str = "interactive") -> Dict:
+    """
+    Fact-check a claim: local gate, then the verdict cache, then verdicts of near-duplicate
+    claims, then published fact-checks, then (in cascade mode) the local NLI model, then
+    the LLM. The LLM call waits for a scheduler slot of the given priority class; raises
+    SchedulerFull when that queue is full. A caller joining an in-flight check of the
+    same claim promotes it to its own priority if that is higher.
+    """
+    gated = await gate_claim(text, force)
+    if gated is not None:
+        tier_counters["gate"] += 1
+        return gated
+
+    key = claim_key(text)
+    cached, signature = await _cached_verdict(key, text)
+    if cached is not None:
+        return dict(cached)
+
+    ticket = flight_tickets.get(key)
+    if ticket is None:
+        ticket = flight_tickets[key] = SlotTicket(priority)
+    else:
+        llm_scheduler.promote(ticket, priority)
+    result = await verification_flight.do(key, lambda: _check_and_cache(key, text, ticket, signature))
+    return dict(result)
+
+async def verify_batch(items: List[Dict]) -> List[Dict]:
+    """
+    Verify many claims concurrently, at most VERIFY_SETTINGS["batch_concurrency"] at a time.
+    Each item holds verify_claim keyword arguments. Returns one result per input,
+    in input order; a failing item does not fail the batch.
+    """
+    semaphore = asyncio.Semaphore(VERIFY_SETTINGS["batch_concurrency"])
+
+    async def verify_item(index: int, item: Dict) -> Dict:
+        async with semaphore:
+            try:
+                result = await verify_claim(**item)
+            except SchedulerFull as e:
+                return {"index": index, "status": "error", "message": str(e), "retry_after": e.retry_after}
+            except Exception as e:
+                return {"index": index, "status": "error", "message": str(e)}
+        if result.get("status") == "error":
+            return {"index": index, "status": "error", "message": result.get("message", "Verification failed")}
+        return {"index": index, "status": "success", "result": result}
+
+    return await asyncio.gather(*(verify_item(i, item) for i, item in enumerate(items)))
+
+async def _cached_verdict(key: str, text: str) -> Tuple[Optional[Dict], Optional[Signature]]:
+    """The cached or near-duplicate verdict, and the claim's signature for caching a new verdict"""
+    cached = verdict_cache.get(key)
+    if cached is not None:
+        tier_counters["cache"] += 1
+        return cached, None
+    signature = await claim_signature(text)
+    cached = reuse_near_duplicate(key, signature)
+    if cached is not None:
+        tier_counters["near_duplicate"] += 1
+    return cached, signature
+
+def _replay(result: Dict) -> List[Dict]:
+    """Stream events for a verdict that is already complete"""
+    events = [{"event": "classification", "data": {"classification": result["classification"]}}]
+    if result.get("explanation"):
+        events.append({"event": "explanation", "data": {"text": result["explanation"]}})
+    for source in result.get("sources", []):
+        events.append({"event": "source", "data": {"source": source}})
+    events.append({"event": "done", "data": dict(result)})
+    return events
+
+async def stream_verify_claim(text: str, force: bool = False, priority: str = "interactive") -> AsyncIterator[Dict]:
+    """
+    Streaming variant of verify_claim. Gated, cached and locally decided results are
+    replayed as events at once; otherwise the LLM answer is streamed and the final verdict is cached.
+    """
+    gated = await gate_claim(text, force)
+    if gated is not None:
+        tier_counters["gate"] += 1
+        yield {"event": "done", "data": gated}
+        return
+
+    key = claim_key(text)
+    cached, signature = await _cached_verdict(key, text)
+    if cached is None:
+        cached = await _local_verdict(text)
+        if cached is not None:
+            _cache_verdict(key, cached, signature)
+    if cached is not None:
+        for event in _replay(cached):
+            yield event
+        return
+
+    tier_counters["llm"] += 1
+    try:
+        async with llm_scheduler.slot(priority):
+            async for event in stream_gpt_fact_check(text):
+                if event["event"] == "done" and event["data"].get("status") == "success":
+                    _cache_verdict(key, event["data"], signature)
+                yield event
+    except SchedulerFull as e:
+        yield {"event": "error", "data": {"message": str(e), "retry_after": e.retry_after}}
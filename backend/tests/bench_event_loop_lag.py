@@ -0,0 +1,58 @@
+"""
+Benchmark: event-loop lag while CPU-bound NLP runs inline vs in the NLP worker pool.
+A ticker coroutine measures how late the loop wakes it while detector calls run.
+The detector is simulated with a CPU-bound stand-in so spaCy/transformers are not needed.
+Run from the backend directory: python tests/bench_event_loop_lag.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.nlp_pool import NLPWorkerPool
+
+TICK = 0.005  # seconds
+CALLS = 40
+
+def cpu_bound_detector(text: str) -> bool:
+    # Stand-in for spaCy parsing + NER on one post (~20 ms of CPU)
+    deadline = time.perf_counter() + 0.02
+    while time.perf_counter() < deadline:
+        pass
+    return True
+
+async def measure(mode: str):
+    pool = NLPWorkerPool({"mode": mode, "pool_size": 2, "max_queue": 256, "preload_models": []})
+    pool.start()
+    if mode == "process":
+        await pool.run(cpu_bound_detector, "warm up")  # spawn workers before measuring
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.run(cpu_bound_detector, f"post {i}") for i in range(CALLS)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    pool.shutdown()
+    lags.sort()
+    return elapsed, lags[len(lags) // 2] * 1000, lags[-1] * 1000
+
+def main():
+    print(f"{'mode':>8} {'total s':>8} {'lag p50 ms':>11} {'lag max ms':>11}")
+    for mode in ("inline", "thread", "process"):
+        elapsed, p50, worst = asyncio.run(measure(mode))
+        print(f"{mode:>8} {elapsed:>8.2f} {p50:>11.1f} {worst:>11.1f}")
+
+if __name__ == "__main__":
+    main()
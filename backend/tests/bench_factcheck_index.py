@@ -0,0 +1,59 @@
+"""
+Benchmark: fact-check index build time and lookup latency on a synthetic corpus.
+Run from the backend directory: python tests/bench_factcheck_index.py [articles]
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.factcheck_index import FactCheckIndex, build_index
+from utils.config import FACTCHECK_INDEX_SETTINGS
+
+RATINGS = ["FALSE", "Misleading", "Needs context", "Fake", "No basis", "True"]
+
+def synthetic_vocabulary(rng: random.Random, size: int):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+
+def synthetic_articles(count: int, vocabulary, rng: random.Random):
+    for i in range(count):
+        claim = " ".join(rng.choices(vocabulary, k=rng.randint(8, 20)))
+        yield {"url": f"https://www.verafiles.org/fact-check/{i}", "title": claim[:60], "claim": claim,
+               "rating": rng.choice(RATINGS)}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    rng = random.Random(42)
+    vocabulary = synthetic_vocabulary(rng, 50000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "factchecks.db")
+        articles = list(synthetic_articles(count, vocabulary, rng))
+        start = time.perf_counter()
+        counts = build_index(path, articles)
+        print(f"built {counts['indexed']} articles in {time.perf_counter() - start:.1f}s "
+              f"({Path(path).stat().st_size / 1e6:.0f} MB)")
+
+        index = FactCheckIndex({**FACTCHECK_INDEX_SETTINGS, "path": path})
+        sample = rng.sample(articles, 200)
+        posts = {
+            "repeat of an indexed claim": [f"Totoo ba ito? {article['claim']}" for article in sample],
+            "unrelated post": [" ".join(rng.choices(vocabulary, k=40)) for _ in range(200)]
+        }
+        print(f"{'posts':>28} {'p50 ms':>8} {'p95 ms':>8} {'hit rate':>9}")
+        for label, texts in posts.items():
+            latencies, hits = [], 0
+            for text in texts:
+                start = time.perf_counter()
+                hits += index.lookup(text) is not None
+                latencies.append((time.perf_counter() - start) * 1000)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{label:>28} {statistics.median(latencies):>8.2f} {p95:>8.2f} {hits / len(texts):>9.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: MicroBatcher vs one pipeline call per request, at several concurrency levels.
+The pipeline is simulated with a fixed per-call overhead plus a per-item cost, which is
+the shape of CPU inference for short Facebook posts.
+Run from the backend directory: python tests/bench_micro_batching.py
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.batching import MicroBatcher
+
+CALL_OVERHEAD = 0.008  # seconds per pipeline call
+ITEM_COST = 0.001  # seconds per text
+REQUESTS = 256
+
+def fake_pipeline(texts):
+    # Busy-wait so the simulated inference holds the CPU (and the GIL) like real inference
+    deadline = time.perf_counter() + CALL_OVERHEAD + ITEM_COST * len(texts)
+    while time.perf_counter() < deadline:
+        pass
+    return [{"label": "ENTAILMENT", "score": 0.9} for _ in texts]
+
+async def run(concurrency: int, batched: bool):
+    batcher = MicroBatcher(fake_pipeline, max_batch_size=16, max_wait=0.005)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            if batched:
+                await batcher.submit(f"post {i}")
+            else:
+                await asyncio.to_thread(fake_pipeline, [f"post {i}"])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    latencies.sort()
+    return REQUESTS / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95)] * 1000
+
+def main():
+    print(f"{'concurrency':>11} {'mode':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for concurrency in (1, 8, 32, 128):
+        for batched in (False, True):
+            throughput, p50, p95 = asyncio.run(run(concurrency, batched))
+            mode = "batched" if batched else "per-call"
+            print(f"{concurrency:>11} {mode:>9} {throughput:>8.1f} {p50:>8.1f} {p95:>8.1f}")
+
+if __name__ == "__main__":
+    main()
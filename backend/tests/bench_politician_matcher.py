@@ -0,0 +1,59 @@
+"""
+Benchmark: compiled PoliticianMatcher vs the previous linear substring scan.
+Run from the backend directory: python tests/bench_politician_matcher.py
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.politician_matcher import PoliticianMatcher
+
+BASE_NAMES = [
+    "Bongbong Marcos", "Joseph Estrada", "Sara Duterte", "Rodrigo Duterte", "Martin Romualdez",
+    "Risa Hontiveros", "Isko Moreno", "Robin Padilla", "Senate", "House", "Duterte", "BBM"
+]
+
+def linear_scan(names, text):
+    """The previous detect_politicians implementation"""
+    return [politician for politician in names if politician in text]
+
+def synthetic_registry(size: int, rng: random.Random):
+    names = list(BASE_NAMES)
+    while len(names) < size:
+        first = rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+        last = rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        names.append(f"{first} {last}")
+    return names
+
+def long_post(rng: random.Random, words: int):
+    vocabulary = ["the", "economy", "will", "grow", "according", "to", "reports", "budget", "Household",
+                  "Senate", "Sara Duterte", "said", "BBM", "claims", "that", "PHP", "billion", "project"]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    rng = random.Random(42)
+    posts = [long_post(rng, words) for words in (50, 500, 5000)]
+    print(f"{'registry':>9} {'words':>6} {'linear ms':>10} {'matcher ms':>11} {'build ms':>9}")
+    for size in (50, 1000, 5000):
+        names = synthetic_registry(size, rng)
+        start = time.perf_counter()
+        matcher = PoliticianMatcher(names)
+        build_ms = (time.perf_counter() - start) * 1000
+        for post in posts:
+            linear_ms = timed(lambda: linear_scan(names, post), 20)
+            matcher_ms = timed(lambda: matcher.detect(post), 20)
+            print(f"{size:>9} {len(post.split()):>6} {linear_ms:>10.3f} {matcher_ms:>11.3f} {build_ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
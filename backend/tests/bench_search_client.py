@@ -0,0 +1,78 @@
+"""
+Benchmark: concurrent fetch_articles calls against a local Custom Search stub server,
+comparing the pooled async SearchManager with a blocking per-query client (the shape
+of the previous googleapiclient build(...).execute() path).
+Run from the backend directory: python tests/bench_search_client.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+from aiohttp import web
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# The stub server needs no real credentials
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("GOOGLE_API_KEY_1", "bench-key")
+os.environ.setdefault("GOOGLE_SEARCH_CX", "bench-cx")
+
+from services.google_service import search_manager
+from services.key_scheduler import KeyScheduler
+from services.news_retrieval import fetch_articles
+
+PORT = 8766
+STUB_LATENCY = 0.05  # seconds per search
+
+async def stub_search(request):
+    await asyncio.sleep(STUB_LATENCY)
+    query = request.query.get("q", "")
+    return web.json_response({"items": [
+        {"title": f"{query} {i}", "link": f"https://www.rappler.com/philippines/{i}"} for i in range(10)
+    ]})
+
+async def blocking_search(query: str):
+    # A synchronous HTTP call inside a coroutine, as the old _api_search did
+    response = requests.get(f"http://127.0.0.1:{PORT}/customsearch/v1", params={"q": query}, timeout=30)
+    return response.json()
+
+async def timed(concurrency: int, fn):
+    start = time.perf_counter()
+    await asyncio.gather(*(fn(f"claim {i}") for i in range(concurrency)))
+    return time.perf_counter() - start
+
+def serve_stub(ready: threading.Event):
+    # Own thread and loop, so a blocking client cannot stall the stub server
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/customsearch/v1", stub_search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", PORT).start()
+        ready.set()
+        await asyncio.Event().wait()
+    asyncio.run(serve())
+
+async def main():
+    ready = threading.Event()
+    threading.Thread(target=serve_stub, args=(ready,), daemon=True).start()
+    ready.wait()
+    search_manager.base_url = f"http://127.0.0.1:{PORT}/customsearch/v1"
+    # Measure the client, not the per-key rate limit
+    search_manager.key_scheduler = KeyScheduler(["bench-key"], rate=1000, burst=1000, daily_quota=10 ** 6, cooldown=60)
+
+    print(f"{'concurrency':>11} {'blocking s':>11} {'async s':>8}")
+    for concurrency in (1, 10, 50):
+        blocking = await timed(concurrency, blocking_search)
+        pooled = await timed(concurrency, fetch_articles)
+        print(f"{concurrency:>11} {blocking:>11.3f} {pooled:>8.3f}")
+
+    await search_manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
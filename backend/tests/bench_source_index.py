@@ -0,0 +1,72 @@
+"""
+Benchmark: compiled SourceIndex vs the previous substring filter in _filter_results
+(fast but never matches the glob patterns) and a correct fnmatch-based glob filter.
+Run from the backend directory: python tests/bench_source_index.py
+"""
+import fnmatch
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from urllib.parse import urlsplit
+from utils.config import get_source_patterns
+from utils.source_index import SourceIndex, get_source_index
+
+HOSTS = [
+    "newsinfo.inquirer.net", "www.gmanetwork.com", "edition.cnn.com", "mb.com.ph", "www.philstar.com",
+    "www.rappler.com", "www.abs-cbn.com", "www.comelec.gov.ph", "psa.gov.ph", "www.officialgazette.gov.ph",
+    "www.tsek.ph", "example.com", "blog.example.org", "www.youtube.com", "en.wikipedia.org"
+]
+PATHS = ["/", "/news/nation/1234", "/philippines/elections", "/sports/basketball", "/2024/05/01/story"]
+
+def substring_filter(items):
+    """The previous _filter_results implementation"""
+    allowed_patterns = get_source_patterns("news") + get_source_patterns("government")
+    return [item for item in items if any(pattern in item['link'] for pattern in allowed_patterns)]
+
+def glob_filter(items):
+    """A correct but uncompiled filter: fnmatch every pattern against host + path"""
+    allowed_patterns = get_source_patterns("news") + get_source_patterns("government")
+    kept = []
+    for item in items:
+        parts = urlsplit(item['link'])
+        target = f"{parts.hostname}{parts.path or '/'}"
+        if any(fnmatch.fnmatchcase(target, pattern) for pattern in allowed_patterns):
+            kept.append(item)
+    return kept
+
+def synthetic_results(size: int, rng: random.Random):
+    return [{"link": f"https://{rng.choice(HOSTS)}{rng.choice(PATHS)}", "title": "result"} for _ in range(size)]
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    rng = random.Random(42)
+    start = time.perf_counter()
+    get_source_index()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"index build: {build_ms:.3f} ms")
+    print(f"{'results':>8} {'substring ms':>13} {'kept':>6} {'glob ms':>9} {'kept':>6} {'index ms':>9} {'kept':>6} {'index lookup ms':>16}")
+    for size in (10, 1000, 100000):
+        items = synthetic_results(size, rng)
+        repeat = 5 if size >= 100000 else 50
+        substring_ms = timed(lambda: substring_filter(items), repeat)
+        glob_ms = timed(lambda: glob_filter(items), repeat)
+        index_ms = timed(lambda: get_source_index().filter(items, ("news", "government")), repeat)
+        lookup_ms = timed(get_source_index, repeat)
+        kept_substring = len(substring_filter(items))
+        kept_glob = len(glob_filter(items))
+        kept_index = len(get_source_index().filter(items, ("news", "government")))
+        print(f"{size:>8} {substring_ms:>13.3f} {kept_substring:>6} {glob_ms:>9.3f} {kept_glob:>6} "
+              f"{index_ms:>9.3f} {kept_index:>6} {lookup_ms:>16.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from utils.batching import MicroBatcher
+
+def test_concurrent_submissions_share_one_batch():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait=0.05)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+
+def test_full_batches_flush_without_waiting():
+    def batch_fn(items):
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait=10)
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 1)
+        stats = batcher.stats()
+        await batcher.close()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    assert results == list(range(8))
+    assert stats["batches"] == 2
+
+def test_batch_failure_reaches_every_caller():
+    def batch_fn(items):
+        raise RuntimeError("model crashed")
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait=0.01)
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(scenario()))
+
+if __name__ == "__main__":
+    pytest.main()
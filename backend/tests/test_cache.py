@@ -0,0 +1,59 @@
+import pytest
+from utils.cache import TTLCache, TieredCache
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_tiered_cache_counts_hits_and_misses():
+    cache = TieredCache("verdicts", max_entries=10, ttl=60)
+    assert cache.get("claim") is None
+    cache.set("claim", {"classification": "FALSE"})
+    assert cache.get("claim") == {"classification": "FALSE"}
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_tiered_cache_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TieredCache("verdicts", max_entries=10, ttl=60, sqlite_path=path)
+    cache.set("claim", {"classification": "TRUE"})
+    cache.disk.close()
+
+    restarted = TieredCache("verdicts", max_entries=10, ttl=60, sqlite_path=path)
+    assert restarted.get("claim") == {"classification": "TRUE"}
+    assert restarted.stats()["disk_hits"] == 1
+    # Promoted to memory on the first disk hit
+    assert restarted.get("claim") == {"classification": "TRUE"}
+    assert restarted.stats()["memory_hits"] == 1
+
+def test_tiered_cache_invalidate_drops_every_tier(tmp_path):
+    cache = TieredCache("verdicts", max_entries=10, ttl=60, sqlite_path=str(tmp_path / "cache.db"))
+    cache.set("claim", {"classification": "FALSE"})
+    assert cache.invalidate("claim") is True
+    assert cache.get("claim") is None
+    assert cache.invalidate("claim") is False
+    assert cache.stats()["invalidations"] == 1
+
+def test_get_entry_serves_stale_values_within_the_grace_period():
+    cache = TieredCache("search_results", max_entries=10, ttl=60)
+    cache.set("query", {"items": []}, ttl=-1)
+    assert cache.get_entry("query", max_stale=60) == ({"items": []}, False)
+    assert cache.get_entry("query") is None
+    assert cache.stats()["stale_hits"] == 1
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from services import cascade, verification
+from utils.cache import TieredCache
+
+ITEMS = [
+    {"title": "PSA: inflation at 3.1%", "snippet": "Inflation eased to 3.1 percent.", "link": "https://psa.gov.ph/a"},
+    {"title": "Rappler", "snippet": "Inflation slowed in May.", "link": "https://www.rappler.com/philippines/b"},
+]
+
+def stub(monkeypatch, scores):
+    async def retrieve_evidence(query):
+        return {"items": ITEMS}
+
+    async def entailment_async(premise, hypothesis):
+        return scores[premise]
+
+    monkeypatch.setattr(cascade, "retrieve_evidence", retrieve_evidence)
+    monkeypatch.setattr(cascade.nli_model, "entailment_async", entailment_async)
+
+def premise(index):
+    return cascade._premise(ITEMS[index])
+
+def test_confident_contradiction_is_false_with_evidence(monkeypatch):
+    stub(monkeypatch, {premise(0): ("contradiction", 0.97), premise(1): ("neutral", 0.8)})
+    result = asyncio.run(cascade.nli_verdict("Inflation hit 10 percent in May"))
+    assert result["classification"] == "FALSE"
+    assert result["evidence"] == [premise(0)]
+    assert result["sources"] == ["PSA: inflation at 3.1% - https://psa.gov.ph/a"]
+
+def test_low_confidence_or_conflicting_evidence_escalates(monkeypatch):
+    stub(monkeypatch, {premise(0): ("entailment", 0.6), premise(1): ("neutral", 0.9)})
+    assert asyncio.run(cascade.nli_verdict("claim")) is None
+    stub(monkeypatch, {premise(0): ("entailment", 0.95), premise(1): ("contradiction", 0.95)})
+    assert asyncio.run(cascade.nli_verdict("claim")) is None
+
+def test_cascade_answers_before_the_llm_and_counts_tiers(monkeypatch):
+    stub(monkeypatch, {premise(0): ("entailment", 0.95), premise(1): ("entailment", 0.92)})
+    llm_calls = []
+
+    async def fake_fact_check(text):
+        llm_calls.append(text)
+        return {"status": "success", "classification": "UNVERIFIED"}
+
+    async def no_published_fact_check(text):
+        return None
+
+    monkeypatch.setattr(verification, "get_gpt_fact_check", fake_fact_check)
+    monkeypatch.setattr(verification, "lookup_fact_check", no_published_fact_check)
+    monkeypatch.setitem(verification.CASCADE_SETTINGS, "enabled", True)
+    monkeypatch.setattr(verification, "verdict_cache", TieredCache("verdicts", max_entries=100, ttl=60))
+    before = dict(verification.tier_counters)
+
+    result = asyncio.run(verification.verify_claim("Sara Duterte said inflation eased to 3.1 percent in May"))
+    assert result["classification"] == "TRUE"
+    assert llm_calls == []
+    assert verification.tier_counters["nli"] == before["nli"] + 1
+    assert verification.tier_stats()["fractions"]["nli"] > 0
+
+def test_failed_search_is_counted_once_and_escalates(monkeypatch):
+    async def retrieve_evidence(query):
+        raise RuntimeError("search quota exhausted")
+
+    monkeypatch.setattr(cascade, "retrieve_evidence", retrieve_evidence)
+    monkeypatch.setattr(cascade, "cascade_counters", dict.fromkeys(cascade.cascade_counters, 0))
+    assert asyncio.run(cascade.nli_verdict("claim")) is None
+    assert cascade.cascade_stats()["errors"] == 1
+    assert cascade.cascade_stats()["checked"] == 1
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from services import chat_sessions as chat_sessions_module
+from services.chat_sessions import ChatSessionStore, estimate_tokens
+from services.llm_service import CHAT_ERROR
+from utils.config import CHAT_SESSION_SETTINGS
+import main
+
+def store(monkeypatch, summarize=None, **overrides):
+    calls = []
+
+    async def chat(message, context=None, history=None):
+        calls.append({"message": message, "context": context, "history": list(history or [])})
+        return f"answer to {message}"
+
+    async def summarize_history(summary, turns, max_tokens):
+        return summarize(summary, turns) if summarize else None
+
+    monkeypatch.setattr(chat_sessions_module, "get_gpt_chat_response", chat)
+    monkeypatch.setattr(chat_sessions_module, "summarize_chat_history", summarize_history)
+    return ChatSessionStore({**CHAT_SESSION_SETTINGS, **overrides}), calls
+
+def test_history_is_kept_server_side_and_context_is_pinned(monkeypatch):
+    sessions, calls = store(monkeypatch)
+    session = sessions.create({"classification": "FALSE", "claim": "Rice at PHP 20"})
+
+    async def scenario():
+        await sessions.send(session, "Why is it false?")
+        await sessions.send(session, "What are the sources?")
+
+    asyncio.run(scenario())
+    assert calls[1]["message"] == "What are the sources?"
+    assert calls[1]["history"] == [
+        {"role": "user", "content": "Why is it false?"},
+        {"role": "assistant", "content": "answer to Why is it false?"}
+    ]
+    assert all('"classification": "FALSE"' in call["context"] for call in calls)
+
+def test_history_beyond_the_budget_is_summarized(monkeypatch):
+    long_message = "x" * 400
+    sessions, calls = store(
+        monkeypatch,
+        summarize=lambda summary, turns: f"{summary}+{len(turns)}",
+        history_budget=estimate_tokens(long_message) * 2 + 10
+    )
+    session = sessions.create({})
+
+    async def scenario():
+        for _ in range(3):
+            await sessions.send(session, long_message)
+
+    asyncio.run(scenario())
+    last_history = calls[-1]["history"]
+    assert last_history[0]["role"] == "system" and "+2" in last_history[0]["content"]
+    assert len(session.turns) == 4
+    assert sessions.stats()["summarized_turns"] == 2
+
+def test_idle_sessions_expire(monkeypatch):
+    sessions, _ = store(monkeypatch, idle_ttl=0)
+    session = sessions.create({})
+    assert sessions.get(session.id) is None
+    assert sessions.stats()["expired"] == 1
+
+def test_failed_turn_is_not_recorded_and_the_endpoint_reports_an_error(monkeypatch):
+    async def failing_chat(message, context=None, history=None):
+        return CHAT_ERROR
+
+    monkeypatch.setattr(chat_sessions_module, "get_gpt_chat_response", failing_chat)
+    client = TestClient(main.app)
+    session_id = client.post("/chat/sessions", json={"context": {}}).json()["session_id"]
+    response = client.post(f"/chat/sessions/{session_id}/messages", json={"message": "Why?"})
+    assert response.status_code == 500
+    assert main.chat_sessions.get(session_id).turns == []
+
+def test_session_with_a_turn_in_flight_is_not_expired(monkeypatch):
+    sessions, _ = store(monkeypatch, idle_ttl=0.01)
+    started = asyncio.Event()
+
+    async def slow_chat(message, context=None, history=None):
+        started.set()
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    monkeypatch.setattr(chat_sessions_module, "get_gpt_chat_response", slow_chat)
+    session = sessions.create({})
+
+    async def scenario():
+        turn = asyncio.ensure_future(sessions.send(session, "Why?"))
+        await started.wait()
+        await asyncio.sleep(0.02)
+        sessions.create({})  # purges idle sessions
+        assert session.id in sessions._sessions
+        await turn
+
+    asyncio.run(scenario())
+    assert sessions.get(session.id) is session
+    assert len(session.turns) == 2
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from services import verification
+from utils import claim_detector
+from utils.claim_detector import detect_claim
+from utils.nlp_pool import NLPWorkerPool
+from utils.claim_patterns import has_claim_signal, has_explicit_claim
+
+FEED_NOISE = [
+    "Happy birthday! Wishing you all the best!",
+    "Easy adobo recipe: you will love this one",
+    "This is the best meme ever",
+]
+
+CHECK_WORTHY = [
+    "Sara Duterte will run for president in 2028",  # politician with an implicit signal
+    "Bongbong Marcos visited Cebu today",  # politician alone
+    "According to PAGASA, the typhoon destroyed 10,000 homes",  # explicit claim language
+]
+
+@pytest.fixture
+def regex_gate(monkeypatch):
+    monkeypatch.setitem(verification.GATE_SETTINGS, "enabled", True)
+    monkeypatch.setitem(verification.GATE_SETTINGS, "use_nlp", False)
+    monkeypatch.setattr(verification, "gate_counters", dict.fromkeys(verification.gate_counters, 0))
+
+@pytest.mark.parametrize("text", FEED_NOISE)
+def test_feed_noise_is_short_circuited(regex_gate, text):
+    result = asyncio.run(verification.gate_claim(text))
+    assert result["status"] == "not_applicable"
+    assert verification.gate_counters["short_circuited"] == 1
+
+@pytest.mark.parametrize("text", CHECK_WORTHY)
+def test_politicians_and_explicit_claims_pass(regex_gate, text):
+    assert asyncio.run(verification.gate_claim(text)) is None
+    assert verification.gate_counters["passed"] == 1
+
+def test_force_bypasses_the_gate(regex_gate):
+    assert asyncio.run(verification.gate_claim(FEED_NOISE[0], force=True)) is None
+    assert verification.gate_counters["bypassed"] == 1
+
+@pytest.mark.parametrize("text", FEED_NOISE)
+def test_nlp_stage_uses_entities_not_implicit_words(regex_gate, monkeypatch, text):
+    monkeypatch.setitem(verification.GATE_SETTINGS, "use_nlp", True)
+    monkeypatch.setattr(verification, "nlp_pool", NLPWorkerPool({**verification.nlp_pool.settings, "mode": "inline"}))
+    monkeypatch.setattr(claim_detector.ner_model, "recognize", lambda text: [])
+    assert asyncio.run(verification.gate_claim(text))["status"] == "not_applicable"
+
+def test_nlp_stage_passes_named_entities(regex_gate, monkeypatch):
+    monkeypatch.setitem(verification.GATE_SETTINGS, "use_nlp", True)
+    monkeypatch.setattr(verification, "nlp_pool", NLPWorkerPool({**verification.nlp_pool.settings, "mode": "inline"}))
+    monkeypatch.setattr(claim_detector.ner_model, "recognize", lambda text: [{"entity": "B-ORG", "word": "DPWH"}])
+    assert asyncio.run(verification.gate_claim("DPWH finished the Cebu bridge")) is None
+
+def test_patterns_match_whole_words_only():
+    assert has_explicit_claim("Experts say rice prices doubled")
+    assert not has_explicit_claim("This is the best meme ever")
+    assert has_claim_signal("This is the best meme ever")
+    assert not has_claim_signal("A small town in Batangas")
+
+def test_detect_claim_accepts_claim_language_before_any_model():
+    # Returns on the pattern check, so no spaCy or NER model is loaded
+    assert detect_claim("Sources say the bridge was never built")
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from services import news_retrieval
+from services.news_retrieval import retrieve_evidence
+
+def fake_fetch(delays, items):
+    async def fetch_articles(query, search_type="news"):
+        await asyncio.sleep(delays.get(search_type, 0))
+        return {"items": items.get(search_type, [])}
+    return fetch_articles
+
+def test_tiers_are_bucketed_and_deduplicated_by_url(monkeypatch):
+    monkeypatch.setattr(news_retrieval, "fetch_articles", fake_fetch({}, {
+        "factcheck": [{"link": "https://www.tsek.ph/claim"}],
+        "government": [{"link": "https://psa.gov.ph/stats"}],
+        "news": [{"link": "https://www.rappler.com/philippines/a"}, {"link": "http://rappler.com/philippines/a/"}]
+    }))
+    evidence = asyncio.run(retrieve_evidence("budget claim"))
+    assert evidence["fact_checks"] == [{"link": "https://www.tsek.ph/claim"}]
+    assert evidence["official_sources"] == [{"link": "https://psa.gov.ph/stats"}]
+    assert evidence["news_results"] == [{"link": "https://www.rappler.com/philippines/a"}]
+    assert len(evidence["items"]) == 3
+    assert evidence["incomplete"] == []
+
+def test_slow_tier_does_not_hold_up_the_deadline(monkeypatch):
+    monkeypatch.setattr(news_retrieval, "fetch_articles", fake_fetch({"government": 5}, {
+        "government": [{"link": "https://psa.gov.ph/stats"}],
+        "news": [{"link": "https://www.philstar.com/story"}]
+    }))
+    evidence, elapsed = asyncio.run(_timed(retrieve_evidence("budget claim", deadline=0.2)))
+    assert elapsed < 1
+    assert evidence["official_sources"] == []
+    assert evidence["news_results"] == [{"link": "https://www.philstar.com/story"}]
+    assert evidence["incomplete"] == ["government"]
+
+async def _timed(coro):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    result = await coro
+    return result, loop.time() - start
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,41 @@
+import pytest
+from services.factcheck_index import FactCheckIndex, build_index, classify_rating, terms
+from utils.config import FACTCHECK_INDEX_SETTINGS
+
+RECORDS = [
+    {"url": "https://www.verafiles.org/fact-check/1", "title": "VERA FILES FACT CHECK: Marcos did not sign PHP 20 rice law",
+     "claim": "Marcos signed a law setting rice at PHP 20 per kilo", "rating": "FALSE"},
+    {"url": "https://www.tsek.ph/2", "title": "Senate budget figures taken out of context",
+     "claim": "The Senate cut the education budget by half", "rating": "Misleading"},
+    {"url": "https://www.tsek.ph/2", "title": "duplicate", "claim": "duplicate", "rating": "FALSE"},
+    {"url": "https://factcheck.afp.com/philippines/3", "title": "Satire", "claim": "Some satire", "rating": "Satire"},
+]
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "factchecks.db")
+    counts = build_index(path, RECORDS)
+    assert counts == {"read": 4, "indexed": 2, "duplicates": 1, "unrated": 1, "invalid": 0}
+    return FactCheckIndex({**FACTCHECK_INDEX_SETTINGS, "path": path, "min_score": 0.0})
+
+def test_terms_and_ratings():
+    assert terms("Ang Pangulo ay nagsabi na ang BIGAS") == ["pangulo", "nagsabi", "bigas"]
+    assert classify_rating("Needs Context.") == "MISLEADING"
+    assert classify_rating("Satire") is None
+
+def test_lookup_returns_the_published_verdict(index):
+    result = index.lookup("BREAKING: Marcos signed a law setting rice at PHP 20 per kilo!!")
+    assert result["classification"] == "FALSE"
+    assert result["sources"] == [
+        "VERA FILES FACT CHECK: Marcos did not sign PHP 20 rice law - https://www.verafiles.org/fact-check/1"
+    ]
+    assert result["fact_check"]["source_name"] == "verafiles"
+    assert result["is_claim"] is True
+    assert len(result["evidence"]) == 1
+
+def test_partial_overlap_is_not_a_match(index):
+    assert index.lookup("Marcos visited the rice fields in Nueva Ecija") is None
+    assert index.stats()["misses"] == 1
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import pytest
+from services import llm_service, ui_highlighter
+
+POST = "Bongbong Marcos signed a law making rice PHP 20 per kilo. Have a great weekend everyone!"
+
+def tool_call(**arguments):
+    arguments = {"explanation": "", "sources": [], **arguments}
+    return {"choices": [{"message": {"tool_calls": [
+        {"function": {"name": "report_fact_check", "arguments": json.dumps(arguments)}}
+    ]}}]}
+
+def test_fused_mode_makes_one_call_per_claim_span(monkeypatch):
+    payloads = []
+
+    async def chat_completion(payload, api_key=None):
+        payloads.append(payload)
+        return tool_call(is_claim=True, classification="FALSE", explanation="No such law.")
+
+    monkeypatch.setattr(llm_service.llm_client, "chat_completion", chat_completion)
+    monkeypatch.setitem(ui_highlighter.HIGHLIGHT_SETTINGS, "mode", "fused")
+    result = asyncio.run(ui_highlighter.highlight_claims(POST))
+
+    assert len(payloads) == 1
+    assert payloads[0]["tool_choice"]["function"]["name"] == "report_fact_check"
+    assert result["status"] == "success"
+    [annotation] = result["annotations"]
+    assert POST[annotation["start"]:annotation["end"]] == annotation["text"]
+    assert annotation["classification"] == "FALSE"
+    assert annotation["color"] == "red"
+
+def test_fused_mode_reports_no_claim(monkeypatch):
+    async def chat_completion(payload, api_key=None):
+        return tool_call(is_claim=False, classification="UNVERIFIED")
+
+    monkeypatch.setattr(llm_service.llm_client, "chat_completion", chat_completion)
+    result = asyncio.run(llm_service.get_fused_claim_check("Bongbong Marcos waved at fans", ["Bongbong Marcos"]))
+    assert result["status"] == "success"
+    assert result["is_claim"] is False
+
+def test_unhighlighted_results_are_escaped(monkeypatch):
+    async def chat_completion(payload, api_key=None):
+        return tool_call(is_claim=False, classification="UNVERIFIED")
+
+    monkeypatch.setattr(llm_service.llm_client, "chat_completion", chat_completion)
+    payload = '<img src=x onerror="alert(1)">'
+    no_politicians = asyncio.run(ui_highlighter.highlight_claims(payload))
+    no_claim = asyncio.run(ui_highlighter.highlight_claims("Bongbong Marcos waved " + payload))
+    assert no_politicians["status"] == "no_politicians"
+    assert no_claim["status"] == "no_claim"
+    for result in (no_politicians, no_claim):
+        assert "<img" not in result["highlighted_html"]
+        assert "&lt;img" in result["highlighted_html"]
+
+def stub_two_stage(monkeypatch, is_claim, claim_delay=0.0):
+    verdict = {"started": False, "cancelled": False}
+
+    async def analyze_politician_claim(text, politicians):
+        await asyncio.sleep(claim_delay)
+        if is_claim is None:
+            raise RuntimeError("claim stage failed")
+        return {"status": "success", "is_claim": is_claim}
+
+    async def get_gpt_fact_check(text):
+        verdict["started"] = True
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            verdict["cancelled"] = True
+            raise
+        return {"status": "success", "classification": "FALSE", "explanation": "x", "evidence": [], "sources": []}
+
+    monkeypatch.setattr(ui_highlighter, "analyze_politician_claim", analyze_politician_claim)
+    monkeypatch.setattr(ui_highlighter, "get_gpt_fact_check", get_gpt_fact_check)
+    return verdict
+
+def run_two_stage():
+    async def scenario():
+        try:
+            return await ui_highlighter._two_stage_analysis(POST, ["Bongbong Marcos"])
+        finally:
+            # Let the cancelled verdict task observe its CancelledError
+            await asyncio.sleep(0)
+    return asyncio.run(scenario())
+
+def test_two_stage_cancels_the_verdict_when_there_is_no_claim(monkeypatch):
+    verdict = stub_two_stage(monkeypatch, is_claim=False, claim_delay=0.01)
+    assert run_two_stage() == {"status": "success", "is_claim": False}
+    assert verdict["started"] and verdict["cancelled"]
+
+def test_two_stage_cancels_the_verdict_when_the_claim_stage_fails(monkeypatch):
+    verdict = stub_two_stage(monkeypatch, is_claim=None, claim_delay=0.01)
+    with pytest.raises(RuntimeError):
+        run_two_stage()
+    assert verdict["cancelled"]
+
+def test_two_stage_returns_the_verdict_for_a_claim(monkeypatch):
+    verdict = stub_two_stage(monkeypatch, is_claim=True)
+    result = run_two_stage()
+    assert result["is_claim"] is True
+    assert result["classification"] == "FALSE"
+    assert not verdict["cancelled"]
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from services.jobs import JobManager, JobQueueFull
+from utils.config import JOB_SETTINGS
+
+def manager(handler, **overrides):
+    return JobManager(handler, {**JOB_SETTINGS, "workers": 2, **overrides})
+
+def test_submit_returns_at_once_and_long_poll_gets_the_result():
+    async def handler(text, force=False, priority="interactive"):
+        await asyncio.sleep(0.05)
+        return {"status": "success", "classification": "FALSE", "text": text}
+
+    async def scenario():
+        jobs = manager(handler)
+        job = jobs.submit(text="claim")
+        assert job.to_dict()["status"] == "queued"
+        assert (await jobs.wait(job, 0)).status in ("queued", "running")
+        finished = await jobs.wait(jobs.get(job.id), 1)
+        await jobs.shutdown()
+        return finished.to_dict()
+
+    result = asyncio.run(scenario())
+    assert result["status"] == "done"
+    assert result["result"]["text"] == "claim"
+
+def test_failed_jobs_report_their_error():
+    async def handler(**params):
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        jobs = manager(handler)
+        job = await jobs.wait(jobs.submit(text="claim"), 1)
+        await jobs.shutdown()
+        return job.to_dict()
+
+    assert asyncio.run(scenario())["error"] == "upstream down"
+
+def test_full_queue_is_rejected():
+    async def handler(**params):
+        await asyncio.sleep(1)
+        return {"status": "success"}
+
+    async def scenario():
+        jobs = manager(handler, workers=1, max_queue=1)
+        jobs.submit(text="a")
+        await asyncio.sleep(0)  # the worker takes job a
+        jobs.submit(text="b")
+        with pytest.raises(JobQueueFull):
+            jobs.submit(text="c")
+        await jobs.shutdown()
+        return jobs.stats()
+
+    assert asyncio.run(scenario())["rejected"] == 1
+
+def test_finished_jobs_expire_after_the_ttl():
+    async def handler(**params):
+        return {"status": "success"}
+
+    async def scenario():
+        jobs = manager(handler, result_ttl=0)
+        job = await jobs.wait(jobs.submit(text="claim"), 1)
+        await jobs.shutdown()
+        return jobs.get(job.id)
+
+    assert asyncio.run(scenario()) is None
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import date
+import pytest
+from services.key_scheduler import KeyScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_scheduler(clock, keys=("key-aaaa", "key-bbbb"), daily_quota=100):
+    return KeyScheduler(list(keys), rate=2.0, burst=1, daily_quota=daily_quota, cooldown=60,
+                        clock=clock, day=lambda: date(2024, 1, 1))
+
+def test_queries_spread_across_keys():
+    scheduler = make_scheduler(FakeClock())
+    first = scheduler.try_acquire()
+    second = scheduler.try_acquire()
+    assert {first.key, second.key} == {"key-aaaa", "key-bbbb"}
+    # Both buckets are empty until they refill
+    assert scheduler.try_acquire() is None
+
+def test_buckets_refill_over_time():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, keys=("key-aaaa",))
+    assert scheduler.try_acquire() is not None
+    assert scheduler.try_acquire() is None
+    clock.now += 0.5
+    assert scheduler.try_acquire() is not None
+
+def test_rate_limited_key_cools_down():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    state = scheduler.try_acquire()
+    scheduler.report_quota_error(state, daily=False)
+    clock.now += 10
+    assert scheduler.try_acquire().key != state.key
+    assert scheduler.stats()[state.label]["quota_errors"] == 1
+
+def test_daily_quota_exhausts_every_key():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, daily_quota=1)
+    assert scheduler.try_acquire() is not None
+    assert scheduler.try_acquire() is not None
+    assert scheduler.all_exhausted()
+    assert asyncio.run(scheduler.acquire(max_wait=1)) is None
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from services.llm_client import LLMClient, llm_client
+import main
+
+def test_session_is_created_lazily_and_reused():
+    client = LLMClient()
+    assert client._session is None
+
+    async def scenario():
+        first = await client.start()
+        second = await client.start()
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second
+    assert first.closed
+    assert client._session is None
+
+def test_closed_session_is_reopened_on_next_use():
+    client = LLMClient()
+
+    async def scenario():
+        first = await client.start()
+        await first.close()
+        second = await client.start()
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is not first
+
+def test_lifespan_opens_and_closes_the_shared_session():
+    with TestClient(main.app):
+        session = llm_client._session
+        assert session is not None and not session.closed
+    assert session.closed
+    assert llm_client._session is None
+
+if __name__ == "__main__":
+    pytest.main()
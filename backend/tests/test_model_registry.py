@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+import models
+from models import ModelRegistry
+
+def test_concurrent_first_calls_load_once():
+    calls = []
+    registry = ModelRegistry()
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("nli", loader)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def first_call():
+        barrier.wait()
+        results.append(registry.get("nli"))
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(model is results[0] for model in results)
+    assert registry.stats()["nli"]["loaded"] is True
+    assert "load_seconds" in registry.metrics["nli"]
+
+def test_failed_load_is_recorded_and_backs_off():
+    calls = []
+    registry = ModelRegistry(load_retry_seconds=60)
+
+    def loader():
+        calls.append(1)
+        raise OSError("model files missing")
+
+    registry.register("ner", loader)
+    with pytest.raises(OSError):
+        registry.get("ner")
+    assert registry.metrics["ner"] == {"error": "model files missing", "failures": 1}
+
+    # Within the back-off window the loader is not run again
+    with pytest.raises(RuntimeError, match="model files missing"):
+        registry.get("ner")
+    assert len(calls) == 1
+    assert registry.stats()["ner"]["loaded"] is False
+
+def test_load_is_retried_after_the_back_off():
+    outcomes = [OSError("out of memory"), "model"]
+    registry = ModelRegistry(load_retry_seconds=0)
+
+    def loader():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    registry.register("nle", loader)
+    with pytest.raises(OSError):
+        registry.get("nle")
+    assert registry.get("nle") == "model"
+    assert "error" not in registry.metrics["nle"]
+
+def test_missing_spacy_model_is_recorded_as_a_failure(monkeypatch):
+    monkeypatch.setitem(models.MODEL_PATHS, "spacy", "does_not_exist")
+    registry = ModelRegistry()
+    registry.register("spacy", models._load_spacy)
+    with pytest.raises(Exception):
+        registry.get("spacy")
+    stats = registry.stats()["spacy"]
+    assert stats["loaded"] is False
+    assert stats["failures"] == 1 and stats["error"]
+
+if __name__ == "__main__":
+    pytest.main()
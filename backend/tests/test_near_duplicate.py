@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import pytest
+from collections import OrderedDict
+from services import verification
+from utils.cache import TieredCache
+from utils.near_duplicate import NearDuplicateIndex, shingles
+
+POST = ("Senator Cynthia Villar said the government spent PHP 5 billion on the new bridge "
+        "in Cebu last year even though construction never started")
+
+def test_shingles_ignore_hashtags_links_and_emoji():
+    assert shingles("Totoo ba ito?! 😡 #FactCheck https://t.co/x See more", 3) == {"totoo ba ito"}
+    assert shingles("Totoo ba ito", 2) == {"totoo ba", "ba ito"}
+
+def test_edited_repost_matches_and_unrelated_text_does_not():
+    index = NearDuplicateIndex()
+    index.add("original", POST)
+    repost = "🚨🚨 " + POST.replace("PHP 5 billion", "PHP 6 billion") + " #Shocking #Share ... See more"
+    match = index.query(repost, threshold=0.7)
+    assert match is not None and match[0] == "original"
+    assert index.query("The weather in Davao is sunny today and the market is open", threshold=0.7) is None
+    assert index.stats()["matches"] == 1
+
+def test_eviction_removes_buckets():
+    index = NearDuplicateIndex(max_entries=1)
+    index.add("a", POST)
+    index.add("b", "Completely different text about rice prices in Manila markets this week")
+    assert len(index) == 1
+    assert index.query(POST, threshold=0.9) is None
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Fresh verdict state and a stubbed LLM; yields the texts sent to the LLM"""
+    calls = []
+
+    async def fake_fact_check(text):
+        calls.append(text)
+        return {"status": "success", "classification": "FALSE", "explanation": "No such spending.", "sources": []}
+
+    async def no_published_fact_check(text):
+        return None
+
+    monkeypatch.setattr(verification, "get_gpt_fact_check", fake_fact_check)
+    monkeypatch.setattr(verification, "lookup_fact_check", no_published_fact_check)
+    monkeypatch.setattr(verification, "verdict_cache", TieredCache("verdicts", max_entries=100, ttl=60))
+    monkeypatch.setattr(verification, "near_duplicates", NearDuplicateIndex())
+    monkeypatch.setattr(verification, "reused_verdicts", OrderedDict())
+    return calls
+
+def test_verify_claim_reuses_and_records_near_duplicate_verdict(llm_calls):
+    first = asyncio.run(verification.verify_claim(POST))
+    second = asyncio.run(verification.verify_claim(POST + " #Share See more"))
+    assert len(llm_calls) == 1
+    assert "reused_from" not in first
+    assert second["classification"] == "FALSE"
+    assert second["reused_from"]["claim_key"] == verification.claim_key(POST)
+    assert second["reused_from"]["similarity"] >= 0.8
+
+def test_invalidating_a_verdict_drops_its_reused_copies(llm_calls):
+    repost = POST + " #Share See more"
+    asyncio.run(verification.verify_claim(POST))
+    asyncio.run(verification.verify_claim(repost))
+    assert len(llm_calls) == 1
+
+    assert verification.invalidate_verdict(POST)
+    assert verification.verdict_cache.get(verification.claim_key(repost)) is None
+    asyncio.run(verification.verify_claim(repost))
+    assert llm_calls == [POST, repost]
+
+def test_signature_is_computed_once_per_new_claim_off_the_event_loop(llm_calls, monkeypatch):
+    index = verification.near_duplicates
+    threads = []
+    signature = index.signature
+
+    def counted_signature(text):
+        threads.append(threading.current_thread())
+        return signature(text)
+
+    monkeypatch.setattr(index, "signature", counted_signature)
+    asyncio.run(verification.verify_claim(POST))
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+    assert len(index) == 1
+
+    # An exact repeat is answered from the verdict cache without hashing
+    asyncio.run(verification.verify_claim(POST))
+    assert len(threads) == 1
+
+if __name__ == "__main__":
+    pytest.main()
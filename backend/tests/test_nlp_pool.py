@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+import pytest
+from utils.config import NLP_POOL_SETTINGS
+from utils.nlp_pool import NLPWorkerPool, NLPPoolFull
+
+def pool(**overrides) -> NLPWorkerPool:
+    return NLPWorkerPool({**NLP_POOL_SETTINGS, **overrides})
+
+def upper(text: str) -> str:
+    return text.upper()
+
+def fail(text: str):
+    raise ValueError(f"cannot parse {text}")
+
+def test_inline_mode_runs_on_the_calling_thread():
+    workers = pool(mode="inline")
+    thread = asyncio.run(workers.run(lambda: threading.current_thread()))
+    assert thread is threading.main_thread()
+    assert asyncio.run(workers.run(upper, "marcos")) == "MARCOS"
+    assert workers._executor is None
+
+def test_thread_mode_runs_off_the_event_loop():
+    workers = pool(mode="thread")
+    thread = asyncio.run(workers.run(lambda: threading.current_thread()))
+    assert thread is not threading.main_thread()
+    assert workers.stats()["completed"] == 1
+
+def test_failures_are_counted_and_raised():
+    workers = pool(mode="thread")
+    with pytest.raises(ValueError):
+        asyncio.run(workers.run(fail, "post"))
+    assert asyncio.run(workers.run(upper, "ok")) == "OK"
+    stats = workers.stats()
+    assert stats["submitted"] == 2
+    assert stats["failed"] == 1
+    assert stats["completed"] == 1
+
+def test_full_queue_raises_nlp_pool_full():
+    workers = pool(mode="thread", pool_size=1, max_queue=1)
+
+    async def scenario():
+        running = asyncio.ensure_future(workers.run(time.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(workers.run(upper, "queued"))
+        await asyncio.sleep(0)
+        with pytest.raises(NLPPoolFull):
+            await workers.run(upper, "rejected")
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(scenario()) == [None, "QUEUED"]
+    stats = workers.stats()
+    assert stats["rejected"] == 1
+    assert stats["waiting"] == 0
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,31 @@
+import pytest
+from services.politician_matcher import PoliticianMatcher
+
+NAMES = ["Sara Duterte", "Rodrigo Duterte", "Duterte", "House", "House of Representatives", "Bongbong Marcos", "BBM"]
+ALIASES = {"BBM": "Ferdinand Marcos Jr.", "Bongbong Marcos": "Ferdinand Marcos Jr."}
+
+def test_matches_respect_word_boundaries():
+    matcher = PoliticianMatcher(NAMES, ALIASES)
+    assert matcher.detect("Household budget tips for Dutertes fans") == []
+    assert matcher.detect("The House passed the bill") == ["House"]
+
+def test_longest_name_wins_and_offsets_are_reported():
+    matcher = PoliticianMatcher(NAMES, ALIASES)
+    text = "Sara Duterte met the House of Representatives"
+    matches = matcher.find_all(text)
+    assert [m.name for m in matches] == ["Sara Duterte", "House of Representatives"]
+    for match in matches:
+        assert text[match.start:match.end] == match.text
+
+def test_aliases_resolve_to_one_canonical_name():
+    matcher = PoliticianMatcher(NAMES, ALIASES)
+    text = "BBM said it first, then Bongbong Marcos said it again. Ferdinand Marcos Jr. agreed."
+    assert matcher.detect(text) == ["Ferdinand Marcos Jr."]
+    assert [m.text for m in matcher.find_all(text)] == ["BBM", "Bongbong Marcos", "Ferdinand Marcos Jr."]
+
+def test_names_ending_in_punctuation_match():
+    matcher = PoliticianMatcher(["Reynaldo Tamayo Jr."])
+    assert matcher.detect("Statement from Reynaldo Tamayo Jr. today") == ["Reynaldo Tamayo Jr."]
+
+if __name__ == "__main__":
+    pytest.main()
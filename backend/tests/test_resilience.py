@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from services.llm_client import LLMClient, LLMError, CircuitOpenError
+from utils.config import LLM_RESILIENCE_SETTINGS
+from utils.resilience import CircuitBreaker, backoff_delay, hedged
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_breaker_opens_then_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.now = 31
+    assert breaker.allow()
+    assert not breaker.allow()  # only one half-open probe
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_acquire_reports_the_probe_owner():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    assert breaker.acquire() == (True, False)
+    breaker.record_failure()
+    clock.now = 11
+    assert breaker.acquire() == (True, True)
+    assert breaker.acquire() == (False, False)
+
+def test_failed_probe_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 11
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.stats()["opened"] == 2
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=0.5, cap=4.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+def test_hedged_returns_the_faster_attempt():
+    delays = iter([1.0, 0.01])
+
+    async def call():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await hedged(call, hedge_after=0.05)
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(scenario())
+    assert result == 0.01
+    assert elapsed < 0.5
+
+def scripted_client(outcomes, **overrides):
+    client = LLMClient(resilience={**LLM_RESILIENCE_SETTINGS, "backoff_base": 0.001, "backoff_cap": 0.001, **overrides})
+    calls = []
+
+    async def request(payload, api_key):
+        calls.append(payload)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client._request = request
+    return client, calls
+
+def test_retries_on_429_and_5xx_then_succeeds():
+    client, calls = scripted_client([LLMError("busy", status=429), LLMError("down", status=503), {"ok": True}])
+    assert asyncio.run(client.chat_completion({})) == {"ok": True}
+    assert len(calls) == 3
+    assert client.stats()["retries"] == 2
+
+def test_client_errors_are_not_retried():
+    client, calls = scripted_client([LLMError("bad request", status=400)])
+    with pytest.raises(LLMError):
+        asyncio.run(client.chat_completion({}))
+    assert len(calls) == 1
+    assert client.breaker.state == "closed"
+
+def test_open_circuit_fails_fast():
+    client, calls = scripted_client([LLMError("down", status=500)] * 2, max_retries=0, breaker_failure_threshold=2)
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            asyncio.run(client.chat_completion({}))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.chat_completion({}))
+    assert len(calls) == 2
+
+def test_cancelled_call_keeps_another_calls_probe():
+    clock = FakeClock()
+    client = LLMClient(resilience={**LLM_RESILIENCE_SETTINGS, "max_retries": 0, "breaker_failure_threshold": 1})
+    client.breaker.clock = clock
+    outcomes = [asyncio.Event(), LLMError("down", status=500), asyncio.Event()]
+
+    async def request(payload, api_key):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        await outcome.wait()
+        return {"ok": True}
+
+    client._request = request
+
+    async def scenario():
+        slow = asyncio.ensure_future(client.chat_completion({}))
+        await asyncio.sleep(0)
+        with pytest.raises(LLMError):
+            await client.chat_completion({})
+        clock.now = 1000
+        probe = asyncio.ensure_future(client.chat_completion({}))
+        await asyncio.sleep(0)
+        slow.cancel()
+        await asyncio.gather(slow, return_exceptions=True)
+        # The probe is still in flight, so a second one must not get through
+        with pytest.raises(CircuitOpenError):
+            await client.chat_completion({})
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        return client.breaker.acquire()
+
+    assert asyncio.run(scenario()) == (True, True)
+
+if __name__ == "__main__":
+    pytest.main()
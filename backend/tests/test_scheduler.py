@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from services import verification, ui_highlighter
+from utils.cache import TieredCache
+from utils.scheduler import PriorityScheduler, SchedulerFull, SlotTicket, classify_priority
+import main
+
+def test_classify_priority():
+    assert classify_priority("facebook_post", "facebook") == "background"
+    assert classify_priority("user_request", "extension") == "interactive"
+
+def test_interactive_waiters_are_served_before_background():
+    order = []
+
+    async def job(scheduler, priority, name):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"interactive": 10, "background": 10})
+        holder = asyncio.ensure_future(job(scheduler, "background", "first"))
+        await asyncio.sleep(0)
+        jobs = [asyncio.ensure_future(job(scheduler, "background", f"scan-{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        jobs.append(asyncio.ensure_future(job(scheduler, "interactive", "chat")))
+        await asyncio.gather(holder, *jobs)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert order == ["first", "chat", "scan-0", "scan-1", "scan-2"]
+    assert scheduler.active == 0
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"interactive": 1, "background": 1})
+        await scheduler.acquire("background")
+        waiter = asyncio.ensure_future(scheduler.acquire("background"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerFull) as excinfo:
+            await scheduler.acquire("background")
+        assert excinfo.value.retry_after >= 1
+        assert scheduler.admits("interactive")
+        scheduler.release()
+        await waiter
+        scheduler.release()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.active == 0
+    assert scheduler.stats()["classes"]["background"]["rejected"] == 1
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"interactive": 10, "background": 10})
+        await scheduler.acquire("interactive")
+        waiter = asyncio.ensure_future(scheduler.acquire("background"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        scheduler.release()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.active == 0
+    assert scheduler.stats()["classes"]["background"]["waiting"] == 0
+
+def test_promoted_ticket_moves_to_the_interactive_queue():
+    order = []
+
+    async def job(scheduler, request, name):
+        async with scheduler.slot(request):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"interactive": 10, "background": 10})
+        holder = asyncio.ensure_future(job(scheduler, "background", "first"))
+        await asyncio.sleep(0)
+        ticket = SlotTicket("background")
+        jobs = [asyncio.ensure_future(job(scheduler, "background", "scan-0")),
+                asyncio.ensure_future(job(scheduler, ticket, "shared"))]
+        await asyncio.sleep(0)
+        scheduler.promote(ticket, "interactive")
+        scheduler.promote(ticket, "background")  # never demoted
+        await asyncio.gather(holder, *jobs)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert order == ["first", "shared", "scan-0"]
+    assert scheduler.stats()["classes"]["interactive"]["promoted"] == 1
+    assert scheduler.active == 0
+
+def test_interactive_caller_promotes_a_background_flight_of_the_same_claim(monkeypatch):
+    order = []
+
+    async def fake_fact_check(text):
+        order.append(text)
+        await asyncio.sleep(0.01)
+        return {"status": "success", "classification": "FALSE"}
+
+    async def no_published_fact_check(text):
+        return None
+
+    scheduler = PriorityScheduler(1, {"interactive": 10, "background": 10})
+    monkeypatch.setattr(verification, "llm_scheduler", scheduler)
+    monkeypatch.setattr(verification, "get_gpt_fact_check", fake_fact_check)
+    monkeypatch.setattr(verification, "lookup_fact_check", no_published_fact_check)
+    monkeypatch.setattr(verification, "verdict_cache", TieredCache("verdicts", max_entries=100, ttl=60))
+    monkeypatch.setitem(verification.NEAR_DUPLICATE_SETTINGS, "enabled", False)
+    monkeypatch.setitem(verification.CASCADE_SETTINGS, "enabled", False)
+
+    def verify(text, priority):
+        return asyncio.ensure_future(verification.verify_claim(text, force=True, priority=priority))
+
+    async def scenario():
+        # The feed scan has already queued four claims behind a running one
+        scans = [verify(f"scan claim {i}", "background") for i in range(5)]
+        await asyncio.sleep(0.005)
+        other = verify("unrelated claim", "interactive")
+        await asyncio.sleep(0)
+        # The user clicks fact-check on a post the scan already sent
+        clicked = verify("scan claim 3", "interactive")
+        results = await asyncio.gather(*scans, other, clicked)
+        return results
+
+    results = asyncio.run(scenario())
+    assert order == ["scan claim 0", "unrelated claim", "scan claim 3",
+                     "scan claim 1", "scan claim 2", "scan claim 4"]
+    assert results[-1]["classification"] == "FALSE"
+    assert verification.flight_tickets == {}
+    assert scheduler.active == 0
+
+def test_interactive_endpoints_answer_429_when_the_queue_is_full(monkeypatch):
+    scheduler = PriorityScheduler(1, {"interactive": 0, "background": 0})
+    scheduler.active = 1
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    monkeypatch.setattr(ui_highlighter, "llm_scheduler", scheduler)
+
+    async def busy_verify_claim(text, force=False, priority="interactive"):
+        raise SchedulerFull(priority, 7)
+
+    monkeypatch.setattr(main, "verify_claim", busy_verify_claim)
+    client = TestClient(main.app)
+    responses = [
+        client.post("/fact-check", json={"text": "Bongbong Marcos signed a rice law"}),
+        client.post("/highlight", json={"text": "Bongbong Marcos signed a law making rice PHP 20 per kilo"}),
+        client.post("/analyze", params={"text": "Bongbong Marcos signed a rice law"})
+    ]
+    assert [response.status_code for response in responses] == [429, 429, 429]
+    assert responses[0].headers["Retry-After"] == "7"
+    assert scheduler.counters["interactive"]["rejected"] == 2
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from services import news_retrieval
+from utils.cache import TieredCache
+
+OLD = {"items": [{"title": "old", "link": "https://www.rappler.com/old"}]}
+NEW = {"items": [{"title": "new", "link": "https://www.rappler.com/new"}]}
+
+@pytest.fixture
+def search_calls(monkeypatch):
+    """Fresh search cache; _api_search answers from the returned list, which tests fill"""
+    calls = []
+    responses = []
+
+    async def api_search(query, search_type):
+        calls.append(query)
+        response = responses.pop(0)
+        if isinstance(response, asyncio.Event):
+            await response.wait()
+            response = responses.pop(0)
+        return response
+
+    monkeypatch.setattr(news_retrieval, "search_cache", TieredCache("search_results", max_entries=100, ttl=60))
+    monkeypatch.setattr(news_retrieval.search_manager, "_api_search", api_search)
+    return calls, responses
+
+def test_stale_entry_is_served_at_once_and_refreshed_in_the_background(search_calls):
+    calls, responses = search_calls
+    key = news_retrieval.search_cache_key("rice price", "news")
+    news_retrieval.search_cache.set(key, OLD, ttl=-1)
+
+    async def scenario():
+        release = asyncio.Event()
+        responses.extend([release, NEW])
+        served = await asyncio.wait_for(news_retrieval.fetch_articles("rice price"), 0.1)
+        pending = list(news_retrieval._refresh_tasks)
+        release.set()
+        await asyncio.gather(*pending)
+        return served, pending
+
+    served, pending = asyncio.run(scenario())
+    assert served == OLD
+    assert len(pending) == 1
+    assert calls == ["rice price"]
+    assert news_retrieval.search_cache.get_entry(key) == (NEW, True)
+    assert news_retrieval.search_cache.counters["stale_hits"] == 1
+
+def test_failed_and_fallback_results_are_not_cached(search_calls):
+    calls, responses = search_calls
+    responses.extend([None, {"status": "success", "sources": "from GPT"}, NEW])
+
+    assert asyncio.run(news_retrieval.fetch_articles("rice price")) is None
+    assert asyncio.run(news_retrieval.fetch_articles("rice price"))["sources"] == "from GPT"
+    assert asyncio.run(news_retrieval.fetch_articles("rice price")) == NEW
+    assert asyncio.run(news_retrieval.fetch_articles("rice price")) == NEW
+    assert len(calls) == 3
+
+if __name__ == "__main__":
+    pytest.main()
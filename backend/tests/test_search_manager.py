@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from services import google_service
+from services.google_service import SearchManager
+from services.key_scheduler import KeyScheduler
+
+KEYS = ["key-aaaa", "key-bbbb", "key-cccc"]
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    async def json(self):
+        return self.body
+
+    async def text(self):
+        return str(self.body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    """Answers each Custom Search call with the next scripted (status, body) for its key"""
+    def __init__(self, script):
+        self.script = {key: list(responses) for key, responses in script.items()}
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append(params["key"])
+        status, body = self.script[params["key"]].pop(0)
+        return FakeResponse(status, body)
+
+def search_manager(monkeypatch, script, max_retries=3):
+    manager = SearchManager(settings={**google_service.SEARCH_SETTINGS, "max_retries": max_retries})
+    manager.key_scheduler = KeyScheduler(KEYS, rate=100, burst=5, daily_quota=100, cooldown=60)
+    session = FakeSession(script)
+
+    async def start():
+        return session
+
+    manager.start = start
+    quota_errors = []
+    report_quota_error = manager.key_scheduler.report_quota_error
+
+    def record_quota_error(state, daily):
+        quota_errors.append((state.key, daily))
+        report_quota_error(state, daily)
+
+    manager.key_scheduler.report_quota_error = record_quota_error
+    fallback_calls = []
+
+    async def generate_sources_gpt(query):
+        fallback_calls.append(query)
+        return {"status": "success", "sources": "from GPT"}
+
+    monkeypatch.setattr(google_service, "generate_sources_gpt", generate_sources_gpt)
+    return manager, session, quota_errors, fallback_calls
+
+OK = (200, {"items": []})
+DAILY = (403, {"error": {"errors": [{"reason": "dailyLimitExceeded"}]}})
+PER_MINUTE = (429, {"error": {"message": "Quota exceeded for quota metric 'Queries' per minute"}})
+PER_DAY_429 = (429, {"error": {"message": "Quota exceeded for quota metric 'Queries' per day"}})
+
+def test_quota_errors_report_the_daily_flag_and_retry_on_the_next_key(monkeypatch):
+    manager, session, quota_errors, fallback_calls = search_manager(
+        monkeypatch, {"key-aaaa": [DAILY], "key-bbbb": [PER_MINUTE], "key-cccc": [OK]}
+    )
+    result = asyncio.run(manager._api_search("rice price", "news"))
+    assert result == {"items": []}
+    assert session.calls == KEYS
+    assert quota_errors == [("key-aaaa", True), ("key-bbbb", False)]
+    assert fallback_calls == []
+
+def test_per_day_429_is_treated_as_daily(monkeypatch):
+    manager, _, quota_errors, _ = search_manager(monkeypatch, {"key-aaaa": [PER_DAY_429], "key-bbbb": [OK], "key-cccc": []})
+    asyncio.run(manager._api_search("rice price", "news"))
+    assert quota_errors == [("key-aaaa", True)]
+
+def test_gpt_fallback_only_after_every_key_is_exhausted(monkeypatch):
+    manager, session, _, fallback_calls = search_manager(
+        monkeypatch, {"key-aaaa": [DAILY], "key-bbbb": [DAILY], "key-cccc": [PER_MINUTE]}
+    )
+    result = asyncio.run(manager._api_search("rice price", "news"))
+    assert session.calls == KEYS
+    assert fallback_calls == ["rice price"]
+    assert result == {"status": "success", "sources": "from GPT"}
+
+def test_no_gpt_fallback_while_a_key_is_still_usable(monkeypatch):
+    # Server errors use up the retries but leave the keys usable
+    manager, session, _, fallback_calls = search_manager(
+        monkeypatch, {"key-aaaa": [(500, "backend error")], "key-bbbb": [(500, "backend error")], "key-cccc": []},
+        max_retries=2
+    )
+    assert asyncio.run(manager._api_search("rice price", "news")) is None
+    assert len(session.calls) == 2
+    assert fallback_calls == []
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,22 @@
+import pytest
+from utils.segmenter import split_sentences
+
+def test_offsets_point_back_into_the_text():
+    text = "Happy Sunday!  BBM claims GDP grew 6.9% in 2023.\nSee more"
+    spans = split_sentences(text)
+    assert [span.text for span in spans] == ["Happy Sunday!", "BBM claims GDP grew 6.9% in 2023.", "See more"]
+    for span in spans:
+        assert text[span.start:span.end] == span.text
+
+def test_titles_and_suffixes_do_not_end_sentences():
+    text = "Sen. Bato and Reynaldo Tamayo Jr. met today. They disagreed."
+    assert [span.text for span in split_sentences(text)] == [
+        "Sen. Bato and Reynaldo Tamayo Jr. met today.",
+        "They disagreed."
+    ]
+
+def test_blank_text_has_no_sentences():
+    assert split_sentences("  \n ") == []
+
+if __name__ == "__main__":
+    pytest.main()
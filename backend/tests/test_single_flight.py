@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from utils.single_flight import SingleFlight
+
+def test_concurrent_duplicates_share_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "verdict"
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("claim", work) for _ in range(10)))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert results == ["verdict"] * 10
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 9, "in_flight": 0}
+
+def test_failure_reaches_every_waiter_and_is_not_remembered():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            flight.do("claim", failing), flight.do("claim", failing), return_exceptions=True
+        )
+        retry = await flight.do("claim", lambda: asyncio.sleep(0, result="ok"))
+        return results, retry
+
+    results, retry = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retry == "ok"
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    async def work():
+        await asyncio.sleep(0.02)
+        return "verdict"
+
+    async def scenario():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("claim", work))
+        second = asyncio.ensure_future(flight.do("claim", work))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+    assert first.cancelled()
+    assert result == "verdict"
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,50 @@
+import pytest
+from utils import source_index
+from utils.source_index import SourceIndex, SourceMatch, parse_pattern, get_source_index, reload_source_index
+from utils.config import SOURCE_CONFIG
+
+index = SourceIndex(SOURCE_CONFIG)
+
+def test_parse_pattern():
+    assert parse_pattern("*.comelec.gov.ph/*") == ("comelec.gov.ph", True, "/")
+    assert parse_pattern("www.rappler.com/philippines*") == ("www.rappler.com", False, "/philippines")
+    assert parse_pattern("www.gmanetwork.com/news/*") == ("www.gmanetwork.com", False, "/news/")
+
+def test_wildcard_patterns_match_subdomains():
+    assert index.match("https://www.comelec.gov.ph/?r=Elections") == SourceMatch("government", "comelec")
+    assert index.match("https://mb.com.ph/2024/01/01/story") == SourceMatch("news", "mb")
+    assert index.match("https://notcomelec.gov.ph/") is None
+
+def test_exact_hosts_and_path_prefixes():
+    assert index.match("https://www.rappler.com/philippines/elections") == SourceMatch("news", "rappler")
+    assert index.match("https://www.rappler.com/sports/") is None
+    assert index.match("https://www.gmanetwork.com/entertainment/") is None
+    assert index.match("https://cnn.com/2024/story") is None
+
+def test_filter_tags_items_and_respects_source_types():
+    items = [
+        {"link": "https://newsinfo.inquirer.net/123/story"},
+        {"link": "https://www.tsek.ph/claim"},
+        {"link": "https://example.com/"},
+    ]
+    assert index.filter(items, ("news", "government")) == [
+        {"link": "https://newsinfo.inquirer.net/123/story", "source_type": "news", "source_name": "inquirer"}
+    ]
+    assert [item["source_name"] for item in index.filter(items)] == ["inquirer", "tsek"]
+
+def test_shared_index_is_built_once_and_rebuilt_on_reload(monkeypatch):
+    monkeypatch.setattr(source_index, "_index", None)
+    assert get_source_index() is get_source_index()
+    link = [{"link": "https://www.example-news.ph/story"}]
+    assert get_source_index().filter(link) == []
+
+    monkeypatch.setitem(SOURCE_CONFIG["news"], "example", {
+        "domain": "example-news.ph", "prefix": "www", "pattern": "www.example-news.ph/*"
+    })
+    reload_source_index()
+    assert get_source_index().filter(link)[0]["source_name"] == "example"
+    monkeypatch.undo()
+    reload_source_index()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import pytest
+from services import llm_service
+from services.llm_client import LLMClient, LLMError
+from services.llm_service import FactCheckStreamParser, stream_gpt_fact_check
+
+RESPONSE = (
+    "THIS IS FALSE!\n"
+    "The bridge budget was PHP 2 billion, not PHP 5 billion.\n"
+    "Sources:\n"
+    "DPWH - https://www.dpwh.gov.ph/a\n"
+    "Rappler - https://www.rappler.com/b\n"
+)
+
+def parse_in_chunks(size: int):
+    parser = FactCheckStreamParser()
+    events = []
+    for start in range(0, len(RESPONSE), size):
+        events.extend(parser.feed(RESPONSE[start:start + size]))
+    events.extend(parser.close())
+    return events
+
+def summarize(events):
+    """Collapse explanation deltas so chunkings can be compared"""
+    return {
+        "classification": [e["data"]["classification"] for e in events if e["event"] == "classification"],
+        "explanation": "".join(e["data"]["text"] for e in events if e["event"] == "explanation").strip(),
+        "sources": [e["data"]["source"] for e in events if e["event"] == "source"],
+        "done": [e["data"] for e in events if e["event"] == "done"],
+    }
+
+@pytest.mark.parametrize("size", [1, 3, 7, len(RESPONSE)])
+def test_any_chunking_yields_the_same_events(size):
+    summary = summarize(parse_in_chunks(size))
+    assert summary["classification"] == ["FALSE"]
+    assert summary["explanation"] == "The bridge budget was PHP 2 billion, not PHP 5 billion."
+    assert summary["sources"] == ["DPWH - https://www.dpwh.gov.ph/a", "Rappler - https://www.rappler.com/b"]
+    assert len(summary["done"]) == 1
+    assert summary["done"][0]["classification"] == "FALSE"
+    assert summary["done"][0]["sources"] == summary["sources"]
+
+def test_sources_header_is_not_streamed_as_explanation():
+    events = parse_in_chunks(1)
+    assert all("Sources" not in e["data"]["text"] for e in events if e["event"] == "explanation")
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, lines):
+        self.content = self._lines(lines)
+
+    async def _lines(self, lines):
+        for line in lines:
+            yield line.encode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def post(self, url, headers=None, json=None):
+        return FakeResponse(self.lines)
+
+def streaming_client(lines):
+    client = LLMClient()
+
+    async def start():
+        return FakeSession(lines)
+
+    client.start = start
+    return client
+
+def delta(text):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": text}}]}) + "\n"
+
+def test_malformed_chunk_raises_llm_error_and_counts_a_failure():
+    client = streaming_client([delta("THIS IS "), "data: {not json\n", delta("FALSE!\n")])
+
+    async def consume():
+        return [d async for d in client.stream_chat_completion({})]
+
+    with pytest.raises(LLMError):
+        asyncio.run(consume())
+    assert client.breaker.stats()["consecutive_failures"] == 1
+
+def test_malformed_chunk_ends_the_fact_check_stream_with_an_error_event(monkeypatch):
+    client = streaming_client([": keep-alive\n", "data:\n", delta("THIS IS FALSE!\n"), "data: {not json\n"])
+    monkeypatch.setattr(llm_service, "llm_client", client)
+
+    async def consume():
+        return [e async for e in stream_gpt_fact_check("claim")]
+
+    events = asyncio.run(consume())
+    assert [e["event"] for e in events] == ["classification", "error"]
+
+if __name__ == "__main__":
+    pytest.main()
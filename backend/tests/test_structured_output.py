@@ -0,0 +1,54 @@
+import asyncio
+import json
+import pytest
+from services import llm_service
+from services.llm_service import FactCheckResult, get_gpt_fact_check, parse_fact_check
+
+def tool_call(arguments: str):
+    return {"choices": [{"message": {"tool_calls": [{"function": {"name": "report_fact_check", "arguments": arguments}}]}}]}
+
+def scripted_client(monkeypatch, responses):
+    payloads = []
+
+    async def chat_completion(payload, api_key=None):
+        payloads.append(payload)
+        return responses.pop(0)
+
+    monkeypatch.setattr(llm_service.llm_client, "chat_completion", chat_completion)
+    return payloads
+
+VALID = json.dumps({"is_claim": True, "classification": "false", "explanation": "No such law.",
+                    "sources": ["Official Gazette - https://www.officialgazette.gov.ph/"]})
+
+def test_valid_function_call_is_parsed_once(monkeypatch):
+    payloads = scripted_client(monkeypatch, [tool_call(VALID)])
+    result = asyncio.run(get_gpt_fact_check("Marcos signed a PHP 20 rice law"))
+    assert result == {
+        "status": "success", "is_claim": True, "classification": "FALSE", "explanation": "No such law.",
+        "evidence": [], "sources": ["Official Gazette - https://www.officialgazette.gov.ph/"],
+        "unverified_reason": "", "analysis": VALID
+    }
+    assert payloads[0]["tool_choice"]["function"]["name"] == "report_fact_check"
+
+def test_malformed_output_is_repaired(monkeypatch):
+    bad = json.dumps({"is_claim": True, "classification": "PANTS ON FIRE", "explanation": "x", "sources": []})
+    payloads = scripted_client(monkeypatch, [tool_call(bad), tool_call(VALID)])
+    result = asyncio.run(get_gpt_fact_check("claim"))
+    assert result["classification"] == "FALSE"
+    assert len(payloads) == 2
+    assert "invalid" in payloads[1]["messages"][-1]["content"]
+
+def test_repair_budget_is_bounded(monkeypatch):
+    payloads = scripted_client(monkeypatch, [tool_call("{not json"), tool_call("{still not json")])
+    result = asyncio.run(get_gpt_fact_check("claim"))
+    assert result["status"] == "error"
+    assert len(payloads) == 2
+
+def test_text_format_produces_the_same_typed_result():
+    result = parse_fact_check("THIS IS MISLEADING!\nTaken out of context.\nSources:\n1. Rappler")
+    assert set(result) == set(FactCheckResult().to_result("").keys())
+    assert result["classification"] == "MISLEADING"
+    assert result["sources"] == ["1. Rappler"]
+
+if __name__ == "__main__":
+    pytest.main()
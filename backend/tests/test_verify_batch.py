@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from services import verification
+import main
+
+def test_results_keep_input_order_and_failures_stay_per_item(monkeypatch):
+    async def fake_verify_claim(text, force=False, priority="interactive"):
+        # Earlier items finish last, so gather order and completion order differ
+        await asyncio.sleep(0.01 * (3 - int(text[-1])))
+        if text == "claim 1":
+            raise RuntimeError("upstream down")
+        if text == "claim 2":
+            return {"status": "error", "message": "LLM failed"}
+        return {"status": "success", "classification": "TRUE", "text": text}
+
+    monkeypatch.setattr(verification, "verify_claim", fake_verify_claim)
+    results = asyncio.run(verification.verify_batch([{"text": f"claim {i}"} for i in range(4)]))
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0] == {"index": 0, "status": "success", "result": {"status": "success", "classification": "TRUE", "text": "claim 0"}}
+    assert results[1] == {"index": 1, "status": "error", "message": "upstream down"}
+    assert results[2] == {"index": 2, "status": "error", "message": "LLM failed"}
+    assert results[3]["result"]["text"] == "claim 3"
+
+def test_batch_concurrency_limit_holds(monkeypatch):
+    running = []
+    peak = []
+
+    async def fake_verify_claim(text, force=False, priority="interactive"):
+        running.append(text)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(text)
+        return {"status": "success", "classification": "TRUE"}
+
+    monkeypatch.setattr(verification, "verify_claim", fake_verify_claim)
+    monkeypatch.setitem(verification.VERIFY_SETTINGS, "batch_concurrency", 3)
+    results = asyncio.run(verification.verify_batch([{"text": f"claim {i}"} for i in range(10)]))
+
+    assert len(results) == 10
+    assert max(peak) == 3
+
+def test_endpoint_rejects_oversized_batch(monkeypatch):
+    monkeypatch.setitem(main.VERIFY_SETTINGS, "max_batch_size", 2)
+    client = TestClient(main.app)
+    response = client.post("/verify/batch", json={"items": [{"text": f"claim {i}"} for i in range(3)]})
+    assert response.status_code == 413
+
+def test_endpoint_classifies_priority_per_item(monkeypatch):
+    seen = []
+
+    async def fake_verify_batch(items):
+        seen.extend(items)
+        return [{"index": i, "status": "success", "result": {}} for i in range(len(items))]
+
+    monkeypatch.setattr(main, "verify_batch", fake_verify_batch)
+    client = TestClient(main.app)
+    response = client.post("/verify/batch", json={"items": [
+        {"text": "scan"},
+        {"text": "click", "type": "user_request", "source": "extension"}
+    ]})
+    assert response.status_code == 200
+    assert [r["index"] for r in response.json()["results"]] == [0, 1]
+    assert [item["priority"] for item in seen] == ["background", "interactive"]
+
+if __name__ == "__main__":
+    pytest.main()
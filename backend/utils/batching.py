@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching for a function that accepts a list of inputs.
+    Concurrent submit() calls are queued; a worker flushes a batch when it reaches
+    max_batch_size or when its oldest item has waited max_wait seconds. Each batch
+    is one batch_fn call, run in a worker thread so CPU-bound inference does not
+    block the event loop, and its results are fanned back out to the callers.
+    """
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int, max_wait: float):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.counters = {"items": 0, "batches": 0, "errors": 0}
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, loop.time()))
+        self._wakeup.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Wait for the batch to fill, but never past the oldest item's deadline
+            while self._pending and len(self._pending) < self.max_batch_size:
+                remaining = self._pending[0][2] + self.max_wait - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            if not self._pending:
+                self._wakeup.clear()
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        # Callers that gave up do not need a slot in the batch
+        live = [(item, future) for item, future, _ in batch if not future.done()]
+        if not live:
+            return
+        items = [item for item, _ in live]
+        self.counters["items"] += len(items)
+        self.counters["batches"] += 1
+        try:
+            results = await asyncio.to_thread(self.batch_fn, items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch function returned {len(results)} results for {len(items)} inputs")
+        except Exception as e:
+            self.counters["errors"] += 1
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "pending": len(self._pending),
+            "avg_batch_size": round(self.counters["items"] / batches, 2) if batches else 0.0
+        }
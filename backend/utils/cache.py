@@ -0,0 +1,179 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class TTLCache:
+    """In-memory LRU cache whose entries expire after a TTL (seconds)"""
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) without checking expiry, refreshing LRU order"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache:
+    """On-disk cache tier backed by SQLite, so entries survive restarts"""
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def set(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class TieredCache:
+    """
+    Two-tier cache: an in-memory LRU with TTL in front of an optional SQLite tier.
+    Values must be JSON-serializable when the disk tier is enabled.
+    """
+    def __init__(self, name: str, max_entries: int, ttl: float, sqlite_path: Optional[str] = None):
+        self.name = name
+        self.ttl = ttl
+        self.memory = TTLCache(max_entries, ttl)
+        self.disk = SQLiteCache(sqlite_path, table=name) if sqlite_path else None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "sets": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return value
+        if self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None and entry[1] > time.time():
+                # Promote to memory, keeping the original expiry
+                self.memory.set(key, entry[0], expires_at=entry[1])
+                self.counters["disk_hits"] += 1
+                return entry[0]
+        self.counters["misses"] += 1
+        return None
+
+    def get_entry(self, key: str, max_stale: float = 0.0) -> Optional[Tuple[Any, bool]]:
+        """
+        Return (value, fresh) for an entry that is live or expired at most
+        max_stale seconds ago, for stale-while-revalidate callers.
+        """
+        now = time.time()
+        entry = self.memory.get_entry(key)
+        tier = "memory_hits"
+        if entry is None and self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None and entry[1] + max_stale > now:
+                self.memory.set(key, entry[0], expires_at=entry[1])
+            tier = "disk_hits"
+        if entry is None or entry[1] + max_stale <= now:
+            self.counters["misses"] += 1
+            return None
+        fresh = entry[1] > now
+        self.counters[tier if fresh else "stale_hits"] += 1
+        return entry[0], fresh
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at)
+        self.counters["sets"] += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Drop a key from every tier; returns True if any tier held it"""
+        removed = self.memory.delete(key)
+        if self.disk is not None:
+            removed = self.disk.delete(key) or removed
+        if removed:
+            self.counters["invalidations"] += 1
+        return removed
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+        lookups = hits + self.counters["stale_hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None
+        }
@@ -1,41 +1,27 @@
-import re
-import spacy
-from models import NERModel
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    nlp = None
+from models import NERModel, model_registry
+from utils.claim_patterns import has_claim_signal
 
+# Cheap to construct: the NER pipeline loads on first use
 ner_model = NERModel()
 
+def has_named_entity(text):
+    """True when the NER model finds any named entity in the text"""
+    return bool(ner_model.recognize(text))
+
 def detect_claim(text):
     """
     Detects claims in English text while maintaining awareness of Filipino context.
     Returns True if a claim is detected; otherwise, False.
     """
-    # English-focused claim patterns
-    claim_patterns = [
-        r"(claims that|states that|alleges that)",
-        r"(according to|says that|believes that)",
-        r"(it is true that|it is false that)",
-        r"(reports indicate|sources say|experts say)"
-    ]
-    
-    # Patterns for implicit claims
-    implicit_patterns = [
-        r"(always|never|all|none|every|no one)",
-        r"(definitely|absolutely|certainly|undoubtedly)",
-        r"(best|worst|most|least)",
-        r"(will|would|should|must|need to)"
-    ]
-    
-    # Check patterns
-    for pattern in claim_patterns + implicit_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
+    # Check explicit and implicit claim patterns
+    if has_claim_signal(text):
+        return True
     
-    # Use NLP if available
+    # Use NLP if available; a failed load is recorded (and backed off) by the registry
+    try:
+        nlp = model_registry.get("spacy")
+    except Exception:
+        nlp = None
     if nlp:
         doc = nlp(text)
         
@@ -54,8 +40,7 @@ def detect_claim(text):
                         return True
     
     # Use NER model to detect entities
-    entities = ner_model.recognize(text)
-    if entities:
+    if has_named_entity(text):
         return True
     
     return False
\ No newline at end of file
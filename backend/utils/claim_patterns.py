@@ -0,0 +1,33 @@
+import re
+
+# English-focused claim patterns
+CLAIM_PATTERNS = [
+    r"(claims that|states that|alleges that)",
+    r"(according to|says that|believes that)",
+    r"(it is true that|it is false that)",
+    r"(reports indicate|sources say|experts say)"
+]
+
+# Patterns for implicit claims. Common in everyday posts ("all the best", "you will love this"),
+# so on their own they never make a post worth an LLM fact check
+IMPLICIT_PATTERNS = [
+    r"(always|never|all|none|every|no one)",
+    r"(definitely|absolutely|certainly|undoubtedly)",
+    r"(best|worst|most|least)",
+    r"(will|would|should|must|need to)"
+]
+
+def _compile(patterns):
+    # One compiled pass over every pattern; word boundaries keep "all" from matching "small"
+    return re.compile(r"\b(?:" + "|".join(patterns) + r")\b", re.IGNORECASE)
+
+EXPLICIT_CLAIM_REGEX = _compile(CLAIM_PATTERNS)
+CLAIM_SIGNAL_REGEX = _compile(CLAIM_PATTERNS + IMPLICIT_PATTERNS)
+
+def has_explicit_claim(text: str) -> bool:
+    """Cheap regex-only check for explicit claim language ("according to", "sources say", ...)"""
+    return EXPLICIT_CLAIM_REGEX.search(text) is not None
+
+def has_claim_signal(text: str) -> bool:
+    """Cheap regex-only check for explicit or implicit claim language"""
+    return CLAIM_SIGNAL_REGEX.search(text) is not None
@@ -60,6 +60,142 @@ GPT_API_KEY = get_api_key()
 GPT_API_URL = "https://api.openai.com/v1/chat/completions"
 GPT_MODEL = "gpt-3.5-turbo"  # Updated to valid model name
 GPT_TIMEOUT = 10  # seconds
+GPT_CONNECT_TIMEOUT = 3  # seconds
+
+# Shared LLM HTTP client (keep-alive connection pool)
+LLM_CLIENT_SETTINGS = {
+    "pool_size": int(os.getenv("LLM_POOL_SIZE", 100)),  # total open connections
+    "per_host_limit": int(os.getenv("LLM_PER_HOST_LIMIT", 20)),  # connections per upstream host
+    "keepalive_timeout": 30,  # seconds an idle connection stays in the pool
+    "connect_timeout": GPT_CONNECT_TIMEOUT,
+    "read_timeout": GPT_TIMEOUT
+}
+
+# Deadlines, retries, circuit breaker and hedging around every LLM call
+LLM_RESILIENCE_SETTINGS = {
+    "deadline": 25,  # seconds for a whole call, retries included
+    "attempt_timeout": GPT_TIMEOUT,  # seconds for a single attempt
+    "max_retries": 2,
+    "retry_statuses": [429, 500, 502, 503, 504],  # timeouts and connection errors are retried too
+    "backoff_base": 0.5,  # seconds; full jitter, doubling per retry
+    "backoff_cap": 4.0,
+    "breaker_failure_threshold": 5,  # consecutive failures that open the circuit
+    "breaker_reset_timeout": 30,  # seconds the circuit stays open before a probe
+    "hedge": os.getenv("LLM_HEDGE", "false").lower() == "true",  # duplicate slow calls at the latency percentile
+    "hedge_percentile": 0.95,
+    "hedge_min_samples": 20,  # latencies observed before hedging starts
+    "latency_window": 200
+}
+
+# Fact checks are returned through a function call validated against FactCheckResult
+STRUCTURED_OUTPUT_SETTINGS = {
+    "enabled": True,  # False restores the free-text "THIS IS ...!" format for get_gpt_fact_check
+    "max_repairs": 1  # re-asks after malformed arguments before giving up
+}
+
+# Admission control for LLM work (verification and chat)
+SCHEDULER_SETTINGS = {
+    "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", 16)),  # LLM calls in flight across all requests
+    "max_queue": {  # waiters per priority class, highest priority first; beyond this requests get 429
+        "interactive": 64,
+        "background": 256
+    },
+    "background_types": ["facebook_post", "politician_mention"],  # VerifyRequest.type of the feed scan
+    "background_sources": []  # VerifyRequest.source values that are always background
+}
+
+# Cascade: the local NLI model checks the claim against retrieved evidence and only
+# uncertain cases go to the LLM
+CASCADE_SETTINGS = {
+    "enabled": os.getenv("VERIFY_CASCADE", "false").lower() == "true",
+    "entail_threshold": 0.9,  # NLI confidence for an evidence snippet to support the claim
+    "contradict_threshold": 0.9,  # NLI confidence for a snippet to refute the claim
+    "min_sources": 1,  # agreeing snippets needed for a local verdict
+    "max_snippets": 6  # evidence snippets scored per claim
+}
+
+# Server-side chat sessions (POST /chat/sessions)
+CHAT_SESSION_SETTINGS = {
+    "idle_ttl": 30 * 60,  # seconds without a message before a session expires
+    "max_sessions": 10000,  # least recently used sessions are dropped beyond this
+    "history_budget": 1500,  # estimated tokens of earlier turns (and their summary) sent per message
+    "context_budget": 1000,  # estimated tokens of the pinned fact-check context
+    "summarize": True,  # fold turns that overflow the budget into a summary instead of dropping them
+    "summary_max_tokens": 200
+}
+
+# Asynchronous verification jobs (POST /jobs, GET /jobs/{id})
+JOB_SETTINGS = {
+    "workers": int(os.getenv("JOB_WORKERS", 16)),  # jobs verified concurrently
+    "max_queue": 1000,  # queued jobs; beyond this POST /jobs returns 429
+    "result_ttl": 10 * 60,  # seconds a finished job's result stays retrievable
+    "max_wait": 30  # seconds a GET /jobs/{id}?wait= long-poll may block
+}
+
+# Verdict cache, keyed on a hash of the normalized claim text
+VERDICT_CACHE_SETTINGS = {
+    "max_entries": 10000,
+    "ttl": 6 * 60 * 60,  # seconds
+    "sqlite_path": os.getenv("VERDICT_CACHE_DB")  # unset keeps the cache in memory only
+}
+
+# Local pre-filter run before any LLM call on /verify and /fact-check
+GATE_SETTINGS = {
+    "enabled": True,
+    "use_nlp": False  # also pass posts where the NER model finds a named entity, when no politician or claim pattern matches
+}
+
+# Reuse verdicts of near-duplicate claims (re-posts with edits, emoji, hashtags, "See more")
+NEAR_DUPLICATE_SETTINGS = {
+    "enabled": True,
+    "threshold": 0.8,  # minimum estimated Jaccard similarity of word shingles
+    "shingle_size": 2,  # words per shingle; short posts need short shingles to survive one-word edits
+    "bands": 16,  # LSH bands x rows = MinHash permutations; candidates from about 0.7 similarity
+    "rows": 8,
+    "max_entries": 50000
+}
+
+# /highlight pipeline
+HIGHLIGHT_SETTINGS = {
+    "mode": "fused",  # "fused": one LLM call returns claim decision and verdict; "two_stage": concurrent calls
+    "segment": True,  # verify claim-bearing sentences separately instead of the whole post
+    "max_spans": 8  # claim-bearing sentences verified per post
+}
+
+# Verification endpoint settings
+VERIFY_SETTINGS = {
+    "max_batch_size": 50,  # items accepted by /verify/batch
+    "batch_concurrency": 8  # items of one batch verified at the same time
+}
+
+# Local transformer / spaCy models, loaded lazily by models.model_registry
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATHS = {
+    "nli": os.getenv("NLI_MODEL_PATH", os.path.join(BACKEND_DIR, "NLI_model")),
+    "nle": os.getenv("NLE_MODEL_PATH", os.path.join(BACKEND_DIR, "NLE_model")),
+    "ner": os.getenv("NER_MODEL_PATH", os.path.join(BACKEND_DIR, "NER_model")),
+    "spacy": os.getenv("SPACY_MODEL", "en_core_web_sm")
+}
+
+MODEL_SETTINGS = {
+    "warm_up": os.getenv("MODEL_WARM_UP", "false").lower() == "true",  # load models in the background at startup
+    "warm_up_models": ["spacy", "ner"],
+    "load_retry_seconds": 30  # after a failed load, calls fail fast for this long before retrying
+}
+
+# Micro-batching of local model inference (NERModel / NLIModel async APIs)
+BATCH_SETTINGS = {
+    "max_batch_size": 16,
+    "max_wait_ms": 10  # longest a request waits for its batch to fill
+}
+
+# Worker pool for CPU-bound NLP (spaCy, NER) called from async handlers
+NLP_POOL_SETTINGS = {
+    "mode": os.getenv("NLP_POOL_MODE", "process"),  # "process", "thread" or "inline"
+    "pool_size": int(os.getenv("NLP_POOL_SIZE", 2)),
+    "max_queue": 256,  # callers allowed to wait for a worker before new work is rejected
+    "preload_models": ["spacy", "ner"]
+}
 
 # Add proxy settings if needed
 PROXY_CONFIG = {
@@ -85,6 +221,14 @@ if not GOOGLE_SEARCH_CX:
 
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 
+# Google API key rotation
+GOOGLE_KEY_SETTINGS = {
+    "daily_quota": int(os.getenv("GOOGLE_DAILY_QUOTA", 100)),  # queries per key per day
+    "burst": 2,  # queries a rested key may send back to back
+    "cooldown": 60,  # seconds a key rests after a 429 rate-limit response
+    "max_wait": 2.0  # seconds a query waits for a free key before giving up
+}
+
 # Filipino Source Configuration
 SOURCE_CONFIG = {
     "government": {
@@ -182,5 +326,40 @@ SEARCH_SETTINGS = {
     "max_results": 10,
     "min_request_interval": 0.5,  # seconds
     "request_timeout": 30,  # seconds
+    "max_connections": 20,  # pooled connections to the Custom Search API
     "max_retries": 3
+}
+
+# Search result cache, keyed on normalized query + search type
+SEARCH_CACHE_SETTINGS = {
+    "ttl": {  # seconds, per source type
+        "news": 15 * 60,
+        "government": 24 * 60 * 60,
+        "factcheck": 24 * 60 * 60
+    },
+    "max_entries": 5000,
+    "sqlite_path": os.getenv("SEARCH_CACHE_DB"),  # unset keeps the cache in memory only
+    "stale_while_revalidate": True,  # serve an expired result while it is refreshed in the background
+    "stale_ttl": 60 * 60  # seconds past expiry a result may still be served
+}
+
+# Evidence retrieval: every source tier is searched concurrently
+EVIDENCE_SETTINGS = {
+    "tiers": {  # bucket order is also the precedence when a URL appears in several tiers
+        "factcheck": {"bucket": "fact_checks", "timeout": 3.0, "max_results": 5},  # seconds
+        "government": {"bucket": "official_sources", "timeout": 4.0, "max_results": 5},
+        "news": {"bucket": "news_results", "timeout": 3.0, "max_results": 8}
+    },
+    "deadline": 5.0  # seconds; tiers still running are dropped from the result
+}
+
+# Local index of published fact-checks, consulted before the LLM
+FACTCHECK_INDEX_SETTINGS = {
+    "enabled": True,
+    "path": os.getenv("FACTCHECK_INDEX_DB"),  # build with: python -m services.factcheck_index ingest dump.jsonl
+    "min_score": 6.0,  # BM25 score of the best match
+    "min_coverage": 0.7,  # fraction of the fact-checked claim's terms that appear in the post
+    "candidates": 5,
+    "max_query_terms": 32,
+    "mmap_size": 256 * 1024 * 1024  # bytes of the index memory-mapped per connection
 }
\ No newline at end of file
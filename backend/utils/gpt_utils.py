@@ -1,14 +1,8 @@
-import json
-import aiohttp
 from typing import Dict
-from utils.config import GPT_API_KEY, GPT_API_URL
+from services.llm_client import llm_client, LLMError
 
 async def generate_sources_gpt(claim: str) -> Dict:
     """Generate sources and evidence using GPT when Google Search fails"""
-    headers = {
-        "Authorization": f"Bearer {GPT_API_KEY}",
-        "Content-Type": "application/json"
-    }
     payload = {
         "model": "gpt-3.5-turbo",
         "messages": [
@@ -16,9 +10,8 @@ async def generate_sources_gpt(claim: str) -> Dict:
             {"role": "user", "content": f"Provide sources and evidence for the following claim: {claim}"}
         ]
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GPT_API_URL, headers=headers, json=payload) as response:
-            if response.status != 200:
-                return {"status": "error", "message": "Failed to fetch GPT response"}
-            data = await response.json()
-            return {"status": "success", "sources": data["choices"][0]["message"]["content"]}
\ No newline at end of file
+    try:
+        data = await llm_client.chat_completion(payload)
+    except LLMError:
+        return {"status": "error", "message": "Failed to fetch GPT response"}
+    return {"status": "success", "sources": data["choices"][0]["message"]["content"]}
\ No newline at end of file
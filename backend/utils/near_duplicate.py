@@ -0,0 +1,121 @@
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+Signature = Tuple[int, ...]
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Noise that differs between re-posts of the same content
+_NOISE = re.compile(r"https?://\S+|#\w+|@\w+|\bsee (?:more|less)\b|\bmagpakita pa\b", re.IGNORECASE)
+
+def shingles(text: str, size: int) -> Set[str]:
+    """Word shingles of the text after stripping links, hashtags, mentions, emoji and punctuation"""
+    text = _NOISE.sub(" ", unicodedata.normalize("NFKC", text).casefold())
+    words = re.findall(r"\w+", text)
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of word shingles, bucketed with banded LSH. Texts whose
+    estimated Jaccard similarity is above roughly (1 / bands) ** (1 / rows) share
+    a bucket with high probability, so candidate lookup touches only the texts
+    in matching buckets rather than every indexed text. The oldest entries are
+    evicted past max_entries.
+    signature() is CPU-bound but pure, so callers may compute it off the event loop
+    once and pass it to query_signature() and add_signature().
+    """
+    def __init__(self, bands: int = 16, rows: int = 8, shingle_size: int = 2, max_entries: int = 50000, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        num_perm = bands * rows
+        # Deterministic universal hash parameters, so signatures are stable across restarts
+        rng_state = hashlib.sha256(str(seed).encode()).digest()
+        params = []
+        while len(params) < 2 * num_perm:
+            rng_state = hashlib.sha256(rng_state).digest()
+            params.extend(int.from_bytes(rng_state[i:i + 8], "little") % MERSENNE_PRIME for i in range(0, 32, 8))
+        self._a = [param or 1 for param in params[:num_perm]]
+        self._b = params[num_perm:2 * num_perm]
+        self._entries: "OrderedDict[str, Signature]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Signature], Set[str]] = {}
+        self.counters = {"queries": 0, "candidates": 0, "matches": 0}
+
+    def signature(self, text: str) -> Optional[Signature]:
+        hashed = [_hash(shingle) for shingle in shingles(text, self.shingle_size)]
+        if not hashed:
+            return None
+        return tuple(
+            min(((a * x + b) % MERSENNE_PRIME) & MAX_HASH for x in hashed)
+            for a, b in zip(self._a, self._b)
+        )
+
+    def _band_keys(self, signature: Signature) -> List[Tuple[int, Signature]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(first: Signature, second: Signature) -> float:
+        """Estimated Jaccard similarity: the fraction of MinHash values the signatures share"""
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+    def add(self, key: str, text: str):
+        self.add_signature(key, self.signature(text))
+
+    def add_signature(self, key: str, signature: Optional[Signature]):
+        if signature is None:
+            return
+        self.remove(key)
+        self._entries[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key: str) -> bool:
+        signature = self._entries.pop(key, None)
+        if signature is None:
+            return False
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+        return True
+
+    def query(self, text: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """The most similar indexed key at or above the threshold, with its similarity"""
+        return self.query_signature(self.signature(text), threshold)
+
+    def query_signature(self, signature: Optional[Signature], threshold: float) -> Optional[Tuple[str, float]]:
+        self.counters["queries"] += 1
+        if signature is None:
+            return None
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        self.counters["candidates"] += len(candidates)
+        best = None
+        for key in candidates:
+            score = self.similarity(signature, self._entries[key])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        if best is not None:
+            self.counters["matches"] += 1
+        return best
+
+    def stats(self) -> Dict:
+        return {**self.counters, "entries": len(self._entries), "buckets": len(self._buckets)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
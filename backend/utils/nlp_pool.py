@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from utils.config import NLP_POOL_SETTINGS
+
+class NLPPoolFull(RuntimeError):
+    """Raised when too many callers are already waiting for an NLP worker"""
+
+def _init_worker(model_names: List[str]):
+    # Runs once in each worker process, so requests never pay model load time
+    from models import model_registry
+    model_registry.warm_up(model_names)
+
+def _has_named_entity(text: str) -> bool:
+    from utils.claim_detector import has_named_entity
+    return has_named_entity(text)
+
+class NLPWorkerPool:
+    """
+    Runs CPU-bound NLP detectors (spaCy parsing, the NER pipeline) off the event loop.
+    Modes: "process" uses a worker process pool whose workers preload the models once,
+    "thread" uses the default thread pool, "inline" runs on the loop (tests, debugging).
+    At most pool_size calls run at once; up to max_queue more wait their turn and any
+    further call raises NLPPoolFull instead of queueing without limit.
+    """
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = settings or NLP_POOL_SETTINGS
+        self.mode = self.settings["mode"]
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def start(self):
+        if self.mode == "process" and self._executor is None:
+            # Workers are spawned on first use; the initializer preloads their models
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.settings["pool_size"],
+                initializer=_init_worker,
+                initargs=(self.settings["preload_models"],)
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a picklable module-level function on a worker"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.settings["pool_size"])
+        if self._slots.locked() and self._waiting >= self.settings["max_queue"]:
+            self.counters["rejected"] += 1
+            raise NLPPoolFull("NLP worker queue is full")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            self.counters["submitted"] += 1
+            if self.mode == "inline":
+                result = fn(*args)
+            else:
+                self.start()
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            self.counters["completed"] += 1
+            return result
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        finally:
+            self._slots.release()
+
+    async def has_named_entity(self, text: str) -> bool:
+        return await self.run(_has_named_entity, text)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "mode": self.mode, "waiting": self._waiting}
+
+nlp_pool = NLPWorkerPool()
@@ -0,0 +1,116 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. After failure_threshold failures in a row
+    the circuit opens and calls fail fast for reset_timeout seconds; then a single
+    probe call is let through (half-open), whose outcome closes or re-opens it.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.counters = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        return self.acquire()[0]
+
+    def acquire(self) -> Tuple[bool, bool]:
+        """Whether a call may proceed, and whether it is the half-open probe"""
+        if self.state == "open":
+            if self.clock() - self.opened_at < self.reset_timeout:
+                self.counters["rejected"] += 1
+                return False, False
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open":
+            if self._probing:
+                self.counters["rejected"] += 1
+                return False, False
+            self._probing = True
+            return True, True
+        return True, False
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def release(self):
+        """
+        Give up a half-open probe without an outcome (e.g. the call was cancelled).
+        Only the call that acquired the probe may release it.
+        """
+        self._probing = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = self.clock()
+            self._probing = False
+
+    def stats(self) -> Dict:
+        return {**self.counters, "state": self.state, "consecutive_failures": self.failures}
+
+class LatencyTracker:
+    """Rolling window of recent call latencies (seconds)"""
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int = 1) -> Optional[float]:
+        if len(self._samples) < max(1, min_samples):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2 ** attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+async def hedged(fn: Callable[[], Awaitable[Any]], hedge_after: float) -> Any:
+    """
+    Run fn(); if it has not finished after hedge_after seconds, start a second
+    fn() and return whichever succeeds first, cancelling the other. A failure is
+    raised only once no attempt is left running.
+    """
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    pending = {first, asyncio.ensure_future(fn())}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
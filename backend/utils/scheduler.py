@@ -0,0 +1,140 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Union
+from utils.config import SCHEDULER_SETTINGS
+
+class SchedulerFull(RuntimeError):
+    """Raised when a priority class's queue is full; retry_after is a hint in seconds"""
+    def __init__(self, priority: str, retry_after: int):
+        super().__init__(f"Server busy: {priority} queue is full")
+        self.priority = priority
+        self.retry_after = retry_after
+
+def classify_priority(request_type: str, source: str) -> str:
+    """Priority class of a verification request, from its VerifyRequest type and source"""
+    if source in SCHEDULER_SETTINGS["background_sources"] or request_type in SCHEDULER_SETTINGS["background_types"]:
+        return "background"
+    return "interactive"
+
+class SlotTicket:
+    """
+    One caller's request for a slot. Work shared by several callers (a single-flight
+    LLM call) holds a ticket so a later, more urgent caller can promote it while it waits.
+    """
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.waiter: Optional[asyncio.Future] = None
+
+class PriorityScheduler:
+    """
+    Admission control for LLM work: at most max_concurrency slots are held at once,
+    and waiters are served strictly by priority class (the order of max_queue),
+    first come first served within a class. Each class has its own bounded queue;
+    acquiring from a full queue raises SchedulerFull instead of waiting.
+    acquire() and slot() take a priority class or a SlotTicket; promote() moves a
+    ticket's waiter to a higher class.
+    """
+    def __init__(self, max_concurrency: int, max_queue: Dict[str, int]):
+        self.max_concurrency = max_concurrency
+        self.max_queue = dict(max_queue)
+        self.priorities = list(max_queue)
+        self.active = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {priority: deque() for priority in self.priorities}
+        self._avg_hold = 1.0  # seconds, moving average of how long a slot is held
+        self.counters = {priority: {"admitted": 0, "queued": 0, "rejected": 0, "promoted": 0} for priority in self.priorities}
+
+    def _waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def admits(self, priority: str) -> bool:
+        """Whether acquire(priority) would currently wait or run rather than be rejected"""
+        return self.active < self.max_concurrency or len(self._queues[priority]) < self.max_queue[priority]
+
+    def retry_after(self, priority: str) -> int:
+        """Seconds until a slot is likely free for this class, from the work queued ahead of it"""
+        ahead = 0
+        for name in self.priorities:
+            ahead += len(self._queues[name])
+            if name == priority:
+                break
+        return max(1, math.ceil(self._avg_hold * (ahead + 1) / self.max_concurrency))
+
+    async def acquire(self, request: Union[str, SlotTicket]):
+        ticket = request if isinstance(request, SlotTicket) else SlotTicket(request)
+        if self.active < self.max_concurrency and not self._waiting():
+            self.active += 1
+            self.counters[ticket.priority]["admitted"] += 1
+            return
+        queue = self._queues[ticket.priority]
+        if len(queue) >= self.max_queue[ticket.priority]:
+            self.counters[ticket.priority]["rejected"] += 1
+            raise SchedulerFull(ticket.priority, self.retry_after(ticket.priority))
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        ticket.waiter = waiter
+        self.counters[ticket.priority]["queued"] += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as this waiter was cancelled
+                self.release()
+            elif waiter in self._queues[ticket.priority]:
+                self._queues[ticket.priority].remove(waiter)
+            raise
+        finally:
+            ticket.waiter = None
+        self.counters[ticket.priority]["admitted"] += 1
+
+    def promote(self, ticket: SlotTicket, priority: str):
+        """
+        Raise a ticket to a higher priority class. A queued waiter moves to the back of
+        that class's queue; the queue bound is not checked, as the work was already admitted.
+        No-op when the ticket already has that priority or a higher one.
+        """
+        if self.priorities.index(priority) >= self.priorities.index(ticket.priority):
+            return
+        previous, ticket.priority = ticket.priority, priority
+        waiter = ticket.waiter
+        if waiter is not None and not waiter.done() and waiter in self._queues[previous]:
+            self._queues[previous].remove(waiter)
+            self._queues[priority].append(waiter)
+            self.counters[priority]["promoted"] += 1
+
+    def release(self):
+        # Hand the slot straight to the highest-priority waiter, if any
+        for priority in self.priorities:
+            queue = self._queues[priority]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, request: Union[str, SlotTicket]) -> AsyncIterator[None]:
+        await self.acquire(request)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._avg_hold = 0.9 * self._avg_hold + 0.1 * (time.monotonic() - start)
+            self.release()
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "avg_hold_seconds": round(self._avg_hold, 3),
+            "classes": {
+                priority: {**self.counters[priority], "waiting": len(self._queues[priority])}
+                for priority in self.priorities
+            }
+        }
+
+llm_scheduler = PriorityScheduler(SCHEDULER_SETTINGS["max_concurrency"], SCHEDULER_SETTINGS["max_queue"])
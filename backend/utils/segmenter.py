@@ -0,0 +1,39 @@
+import re
+from typing import List, NamedTuple
+
+class SentenceSpan(NamedTuple):
+    start: int
+    end: int
+    text: str
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) before whitespace, or a line break.
+# "6.9%" and "P1.5B" are not boundaries because the period is not followed by whitespace.
+_SENTENCE_END = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s|$)|\n")
+_LAST_WORD = re.compile(r"(\w+)$")
+
+# Titles and suffixes common in Philippine political posts that end in a period
+ABBREVIATIONS = {
+    "jr", "sr", "sen", "rep", "pres", "vp", "gov", "gen", "atty", "hon", "sec", "usec",
+    "mr", "mrs", "ms", "dr", "st", "no", "vs", "engr", "brgy", "capt"
+}
+
+def _append_span(spans: List[SentenceSpan], text: str, start: int, end: int):
+    segment = text[start:end]
+    stripped = segment.strip()
+    if stripped:
+        offset = start + len(segment) - len(segment.lstrip())
+        spans.append(SentenceSpan(offset, offset + len(stripped), stripped))
+
+def split_sentences(text: str) -> List[SentenceSpan]:
+    """Split text into sentences, keeping character offsets into the original text"""
+    spans: List[SentenceSpan] = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        if match.group(0).startswith("."):
+            word = _LAST_WORD.search(text, start, match.start())
+            if word and word.group(1).lower() in ABBREVIATIONS:
+                continue
+        _append_span(spans, text, start, match.end())
+        start = match.end()
+    _append_span(spans, text, start, len(text))
+    return spans
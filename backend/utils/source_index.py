@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from utils.config import SOURCE_CONFIG
+
+HOST_MEMO_SIZE = 4096
+
+class SourceMatch(NamedTuple):
+    source_type: str  # "government", "news" or "factcheck"
+    source_name: str  # key in SOURCE_CONFIG, e.g. "rappler"
+
+class _Rule(NamedTuple):
+    path_prefix: str
+    subdomains: bool  # True for "*." patterns, which also match any subdomain
+    match: SourceMatch
+
+def split_url(url: str) -> Tuple[str, str]:
+    """
+    (host, path) of a URL. Hand-rolled instead of urllib.parse.urlsplit, which
+    dominates the filter's cost on large result sets.
+    """
+    start = url.find("://")
+    start = start + 3 if start >= 0 else (2 if url.startswith("//") else 0)
+    end = len(url)
+    for delimiter in "/?#":
+        position = url.find(delimiter, start, end)
+        if position >= 0:
+            end = position
+    host = url[start:end].rpartition("@")[2].partition(":")[0].rstrip(".").lower()
+    path = url[end:]
+    if not path.startswith("/"):
+        path = "/"
+    return host, path
+
+def parse_pattern(pattern: str) -> Tuple[str, bool, str]:
+    """
+    Split a SOURCE_CONFIG glob such as "*.comelec.gov.ph/*" or
+    "www.rappler.com/philippines*" into (host, subdomains, path_prefix).
+    """
+    host, _, path = pattern.partition("/")
+    subdomains = host.startswith("*.")
+    if subdomains:
+        host = host[2:]
+    path_prefix = "/" + path.split("*", 1)[0]
+    return host.lower(), subdomains, path_prefix
+
+class SourceIndex:
+    """
+    Host-suffix trie over the SOURCE_CONFIG patterns. A URL is matched by walking
+    its host labels from the TLD inwards, then checking path prefixes at the nodes
+    visited, so lookups cost one pass over the host regardless of config size.
+    The rules reachable from each host are memoized, since results repeat hosts.
+    """
+    def __init__(self, config: Dict[str, Dict[str, Dict]]):
+        self._trie: Dict = {}
+        self._host_rules: Dict[str, List[_Rule]] = {}
+        for source_type, sources in config.items():
+            for source_name, info in sources.items():
+                host, subdomains, path_prefix = parse_pattern(info["pattern"])
+                node = self._trie
+                for label in reversed(host.split(".")):
+                    node = node.setdefault(label, {})
+                node.setdefault("", []).append(_Rule(path_prefix, subdomains, SourceMatch(source_type, source_name)))
+        # Longest path prefix wins when several rules share a host
+        self._sort(self._trie)
+
+    def _sort(self, node: Dict):
+        for label, child in node.items():
+            if label:
+                self._sort(child)
+            else:
+                child.sort(key=lambda rule: len(rule.path_prefix), reverse=True)
+
+    def _rules_for_host(self, host: str) -> List[_Rule]:
+        """Rules applicable to a host, most specific host first, memoized per host"""
+        rules = self._host_rules.get(host)
+        if rules is None:
+            labels = host.split(".")
+            node = self._trie
+            rules = []
+            for depth, label in enumerate(reversed(labels), 1):
+                node = node.get(label)
+                if node is None:
+                    break
+                exact = depth == len(labels)
+                rules[:0] = [rule for rule in node.get("", ()) if exact or rule.subdomains]
+            if len(self._host_rules) >= HOST_MEMO_SIZE:
+                self._host_rules.clear()
+            self._host_rules[host] = rules
+        return rules
+
+    def match(self, url: str, source_types: Optional[Iterable[str]] = None) -> Optional[SourceMatch]:
+        """The most specific source the URL belongs to, or None if it is not an allowed source"""
+        host, path = split_url(url)
+        if not host:
+            return None
+        allowed = source_types if source_types is None or isinstance(source_types, frozenset) else frozenset(source_types)
+        for rule in self._rules_for_host(host):
+            if path.startswith(rule.path_prefix) and (allowed is None or rule.match.source_type in allowed):
+                return rule.match
+        return None
+
+    def filter(self, items: List[Dict], source_types: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Keep search results from allowed sources, tagging each with its source type and name"""
+        allowed = frozenset(source_types) if source_types is not None else None
+        filtered = []
+        for item in items:
+            match = self.match(item.get("link", ""), allowed)
+            if match is not None:
+                filtered.append({**item, "source_type": match.source_type, "source_name": match.source_name})
+        return filtered
+
+_index: Optional[SourceIndex] = None
+
+def get_source_index() -> SourceIndex:
+    """The compiled index for SOURCE_CONFIG, built on first use"""
+    global _index
+    if _index is None:
+        _index = SourceIndex(SOURCE_CONFIG)
+    return _index
+
+def reload_source_index() -> SourceIndex:
+    """Recompile the index; call after changing SOURCE_CONFIG at runtime"""
+    global _index
+    _index = SourceIndex(SOURCE_CONFIG)
+    return _index
@@ -34,10 +34,12 @@ const messageHandlers = {
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     text: request.text,
-                    // Add any additional required fields
-                    type: 'facebook_post',
+                    // User-triggered: scheduled ahead of the background feed scan
+                    type: 'user_request',
                     source: 'facebook',
-                    politicians: request.politicians || []
+                    politicians: request.politicians || [],
+                    // The user asked for this check; the pre-filter only applies to the feed scan
+                    force: true
                 })
             });
             
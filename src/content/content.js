@@ -1,10 +1,12 @@
 const API_BASE_URL = 'http://localhost:8000';
 const SCAN_INTERVAL = 5000;
+const VERIFY_BATCH_SIZE = 50;
 let isProcessing = false;
 
 // API endpoints
 const ENDPOINTS = {
     VERIFY: `${API_BASE_URL}/verify`,
+    VERIFY_BATCH: `${API_BASE_URL}/verify/batch`,
     POLITICIANS: `${API_BASE_URL}/politicians`
 };
 
@@ -145,6 +147,40 @@ async function verifyContent(text) {
     }
 }
 
+async function verifyContentBatch(texts) {
+    try {
+        const response = await fetch(ENDPOINTS.VERIFY_BATCH, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                items: texts.map(text => ({
+                    text: text,
+                    type: 'facebook_post',
+                    source: 'facebook',
+                    politicians: []
+                }))
+            })
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            console.error('Batch verification failed:', errorData);
+            return texts.map(() => null);
+        }
+
+        const data = await response.json();
+        // Results come back in input order, each with its own status
+        return data.results.map(item => item.status === 'success' ? item.result : null);
+    } catch (error) {
+        console.error('Batch verification failed:', error);
+        return texts.map(() => null);
+    }
+}
+
+function findMentionedPoliticians(text) {
+    return POLITICIANS_KEYWORDS.filter(politician => text.includes(politician));
+}
+
 function highlightPoliticians(element, politicians) {
     politicians.forEach(politician => {
         const regex = new RegExp(`\\b${politician}\\b`, 'gi');
@@ -216,23 +252,35 @@ async function scanFacebookContent() {
         const posts = document.querySelectorAll(FACEBOOK_SELECTORS.postContent);
         console.log(`Found ${posts.length} posts`);
 
+        const pending = [];
         for (const post of posts) {
             if (!post.hasAttribute('data-verifai-checked')) {
                 const content = post.innerText;
                 console.log(`Analyzing post content: ${content}`);
                 
-                const mentionedPoliticians = await detectPoliticians(content);
+                const mentionedPoliticians = findMentionedPoliticians(content);
                 if (mentionedPoliticians.length > 0) {
-                    const verificationResult = await verifyContent(content);
-                    if (verificationResult?.classification) {
-                        highlightPoliticians(post, mentionedPoliticians);
-                        underlineText(post, verificationResult);
-                        post.setAttribute('data-fact-check', verificationResult.analysis);
-                    }
+                    pending.push({ post, content, mentionedPoliticians });
+                } else {
+                    post.setAttribute('data-verifai-checked', 'true');
                 }
-                post.setAttribute('data-verifai-checked', 'true');
             }
         }
+
+        // One /verify/batch round trip per chunk instead of one /verify call per post
+        for (let start = 0; start < pending.length; start += VERIFY_BATCH_SIZE) {
+            const chunk = pending.slice(start, start + VERIFY_BATCH_SIZE);
+            const results = await verifyContentBatch(chunk.map(item => item.content));
+            chunk.forEach(({ post, mentionedPoliticians }, index) => {
+                const verificationResult = results[index];
+                if (verificationResult?.classification) {
+                    highlightPoliticians(post, mentionedPoliticians);
+                    underlineText(post, verificationResult);
+                    post.setAttribute('data-fact-check', verificationResult.analysis);
+                }
+                post.setAttribute('data-verifai-checked', 'true');
+            });
+        }
     } catch (error) {
         console.error('Scan error:', error);
     } finally {
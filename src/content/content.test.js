@@ -0,0 +1,32 @@
+// Run with: node --test src/content/
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('node:fs');
+const path = require('node:path');
+const vm = require('node:vm');
+
+// content.js is a plain content script; load it into a sandbox with just enough of the page stubbed
+function loadContentScript() {
+    const sandbox = {
+        console: { log() {}, error() {} },
+        document: { body: {}, querySelectorAll: () => [] },
+        MutationObserver: class { observe() {} },
+        Node: { ELEMENT_NODE: 1 },
+        setInterval() {},
+        fetch: async () => ({ ok: false, json: async () => ({}) })
+    };
+    vm.createContext(sandbox);
+    vm.runInContext(fs.readFileSync(path.join(__dirname, 'content.js'), 'utf8'), sandbox);
+    return sandbox;
+}
+
+test('findMentionedPoliticians returns every known politician in the text', () => {
+    const { findMentionedPoliticians } = loadContentScript();
+    const found = findMentionedPoliticians('Isko Moreno and Bongbong Marcos met in Manila today');
+    assert.deepStrictEqual([...found].sort(), ['Bongbong Marcos', 'Isko Moreno']);
+});
+
+test('findMentionedPoliticians returns nothing for posts without politicians', () => {
+    const { findMentionedPoliticians } = loadContentScript();
+    assert.strictEqual(findMentionedPoliticians('Happy birthday! Wishing you all the best!').length, 0);
+});
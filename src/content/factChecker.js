@@ -8,7 +8,9 @@ async function factCheck(text) {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ text })
+            // User-triggered checks are scheduled ahead of the background feed scan
+            // and skip the pre-filter, which only applies to the feed scan
+            body: JSON.stringify({ text, type: 'user_request', source: 'extension', force: true })
         });
         const result = await response.json();
         return result;